@@ -13,13 +13,22 @@ A2UI Protocol Compliance:
 - Optional children field for layout components
 """
 
+import io
 import uuid
-import json
 import re
+from itertools import islice
 from typing import Any, AsyncGenerator
+from urllib.parse import urlsplit
 from pydantic import BaseModel, Field, field_validator
 
 
+# Schemes accepted for external links
+URL_SCHEMES = ('http://', 'https://')
+
+# Loopback hosts rejected as external links
+LOCALHOST_PATTERNS = ('://localhost', '://127.0.0.1', '://0.0.0.0', '://[::1]')
+
+
 def is_valid_external_url(url: str) -> bool:
     """
     Check if URL is a valid, complete external URL.
@@ -31,14 +40,13 @@ def is_valid_external_url(url: str) -> bool:
     url = url.strip()
 
     # Must be absolute URL with scheme
-    if not url.startswith(('http://', 'https://')):
+    if not url.startswith(URL_SCHEMES):
         return False
 
     # Reject localhost/loopback
-    localhost_patterns = ['://localhost', '://127.0.0.1', '://0.0.0.0', '://[::1]']
-    for pattern in localhost_patterns:
-        if pattern in url.lower():
-            return False
+    lowered = url.lower()
+    if any(pattern in lowered for pattern in LOCALHOST_PATTERNS):
+        return False
 
     # Must have a domain after the scheme (https://x.xx minimum)
     if len(url) < 12:
@@ -408,16 +416,15 @@ async def emit_components(
         data: {"type": "a2ui.StatCard", "id": "stat-card-2", ...}
     """
     for component in components:
-        # Convert component to dict for JSON serialization
-        component_dict = component.model_dump(exclude_none=True)
+        # Serialize straight from pydantic-core, skipping the intermediate dict
+        json_str = component.model_dump_json(exclude_none=True)
 
         if stream_format == "ag-ui":
             # AG-UI SSE format: "data: {json}\n\n"
-            json_str = json.dumps(component_dict)
             yield f"data: {json_str}\n\n"
         elif stream_format == "json":
             # Plain JSON (for testing or alternative protocols)
-            yield json.dumps(component_dict) + "\n"
+            yield json_str + "\n"
         else:
             raise ValueError(f"Unknown stream format: {stream_format}")
 
@@ -605,6 +612,10 @@ def generate_trend_indicator(
     return generate_component("a2ui.TrendIndicator", props)
 
 
+# Event classifications accepted by TimelineEvent
+TIMELINE_EVENT_TYPES = frozenset({"article", "announcement", "milestone", "update"})
+
+
 def generate_timeline_event(
     title: str,
     timestamp: str,
@@ -641,11 +652,10 @@ def generate_timeline_event(
         >>> event.props["eventType"]
         "milestone"
     """
-    valid_event_types = {"article", "announcement", "milestone", "update"}
-    if event_type not in valid_event_types:
+    if event_type not in TIMELINE_EVENT_TYPES:
         raise ValueError(
             f"Invalid event_type: {event_type}. "
-            f"Must be one of: {', '.join(valid_event_types)}"
+            f"Must be one of: {', '.join(TIMELINE_EVENT_TYPES)}"
         )
 
     props = {
@@ -899,7 +909,7 @@ def generate_image_card(
         raise ValueError("ImageCard requires a valid image_url")
 
     # Basic URL validation (check for http/https)
-    if not image_url.startswith(("http://", "https://")):
+    if not image_url.startswith(URL_SCHEMES):
         raise ValueError(f"image_url must be a valid URL starting with http:// or https://, got: {image_url}")
 
     props = {
@@ -2008,7 +2018,7 @@ def extract_domain(url: str) -> str:
         raise ValueError("URL cannot be empty")
 
     # Ensure URL has scheme for parsing
-    if not url.startswith(("http://", "https://")):
+    if not url.startswith(URL_SCHEMES):
         raise ValueError(f"URL must start with http:// or https://, got: {url}")
 
     # Parse URL
@@ -2150,7 +2160,7 @@ def generate_link_card(
     if not url or not url.strip():
         raise ValueError("LinkCard requires a valid URL")
 
-    if not url.startswith(("http://", "https://")):
+    if not url.startswith(URL_SCHEMES):
         raise ValueError(f"URL must start with http:// or https://, got: {url}")
 
     # Auto-extract domain if not provided
@@ -2238,7 +2248,7 @@ def generate_tool_card(
     if not url or not url.strip():
         raise ValueError("ToolCard requires a valid URL")
 
-    if not url.startswith(("http://", "https://")):
+    if not url.startswith(URL_SCHEMES):
         raise ValueError(f"URL must start with http:// or https://, got: {url}")
 
     # Validate pricing if provided
@@ -2355,7 +2365,7 @@ def generate_book_card(
             )
 
     # Validate URL if provided
-    if url and not url.startswith(("http://", "https://")):
+    if url and not url.startswith(URL_SCHEMES):
         raise ValueError(f"URL must start with http:// or https://, got: {url}")
 
     props = {
@@ -2460,7 +2470,7 @@ def generate_repo_card(
             repo_url = repo_info["url"]
         except ValueError:
             # Not a GitHub URL, use as-is
-            if not repo_url.startswith(("http://", "https://")):
+            if not repo_url.startswith(URL_SCHEMES):
                 raise ValueError(f"repo_url must start with http:// or https://, got: {repo_url}")
 
     # Construct GitHub URL from owner + name if not provided
@@ -2693,7 +2703,7 @@ def generate_company_card(
 
     # Validate website URL format if provided
     if website:
-        if not website.startswith(("http://", "https://")):
+        if not website.startswith(URL_SCHEMES):
             raise ValueError(f"Website URL must start with http:// or https://, got: {website}")
 
     # Validate founded_year if provided
@@ -4682,7 +4692,8 @@ def generate_tag(
         ... )
     """
     # Validate label
-    if not label or not label.strip():
+    label = label.strip() if label else ""
+    if not label:
         raise ValueError("Tag label cannot be empty")
 
     # Validate type
@@ -4693,7 +4704,7 @@ def generate_tag(
         )
 
     props = {
-        "label": label.strip(),
+        "label": label,
         "type": type,
     }
 
@@ -4771,7 +4782,8 @@ def generate_badge(
         ... )
     """
     # Validate label
-    if not label or not label.strip():
+    label = label.strip() if label else ""
+    if not label:
         raise ValueError("Badge label cannot be empty")
 
     # Validate count
@@ -4795,7 +4807,7 @@ def generate_badge(
         )
 
     props = {
-        "label": label.strip(),
+        "label": label,
         "count": count,
         "style": style,
         "size": size,
@@ -4858,7 +4870,8 @@ def generate_category_tag(
         ... )
     """
     # Validate name
-    if not name or not name.strip():
+    name = name.strip() if name else ""
+    if not name:
         raise ValueError("CategoryTag name cannot be empty")
 
     # Validate color format if provided
@@ -4876,7 +4889,7 @@ def generate_category_tag(
         # No further validation needed for semantic names
 
     props = {
-        "name": name.strip(),
+        "name": name,
     }
 
     # Add optional color
@@ -4958,9 +4971,10 @@ def generate_status_indicator(
 
     # Add optional label
     if label is not None:
-        if not label.strip():
+        label = label.strip()
+        if not label:
             raise ValueError("StatusIndicator label cannot be empty when provided")
-        props["label"] = label.strip()
+        props["label"] = label
 
     return generate_component("a2ui.StatusIndicator", props)
 
@@ -5027,13 +5041,26 @@ def generate_priority_badge(
 
     # Add optional label
     if label is not None:
-        if not label.strip():
+        label = label.strip()
+        if not label:
             raise ValueError("PriorityBadge label cannot be empty when provided")
-        props["label"] = label.strip()
+        props["label"] = label
 
     return generate_component("a2ui.PriorityBadge", props)
 
 
+# Technologies tagged by the heuristic orchestrator (matched case-insensitively)
+_ORCHESTRATOR_TECH_PATTERNS = (
+    'React', 'Vue', 'Python', 'JavaScript', 'TypeScript', 'Docker', 'Kubernetes', 'AWS', 'Azure'
+)
+
+# Standalone integers with an optional trailing percent sign, used for StatCards
+_NUMBER_TOKEN_REGEX = re.compile(r'\b\d+[%]?\b')
+
+# Hosts already covered by RepoCard/VideoCard, skipped when building LinkCards
+_ORCHESTRATOR_EXCLUDED_LINK_HOSTS = ("github.com", "youtube.com")
+
+
 def orchestrate_dashboard(markdown_content: str) -> list[A2UIComponent]:
     """
     Orchestrate complete dashboard generation pipeline from markdown to components.
@@ -5066,11 +5093,11 @@ def orchestrate_dashboard(markdown_content: str) -> list[A2UIComponent]:
         True
         >>> # Components can be streamed via AG-UI or rendered directly
     """
-    from content_analyzer import parse_markdown, ContentAnalysis, _classify_heuristic
+    from content_analyzer import parse_markdown_cached, ContentAnalysis, _classify_heuristic
     from layout_selector import _get_layout_from_document_type, _apply_rule_based_selection
 
-    # Step 1: Parse markdown to extract structure
-    parsed = parse_markdown(markdown_content)
+    # Step 1: Parse markdown to extract structure (cached for repeated regenerations)
+    parsed = parse_markdown_cached(markdown_content)
 
     # Step 2: Build content analysis (synchronous version without LLM)
     entities = {
@@ -5083,8 +5110,7 @@ def orchestrate_dashboard(markdown_content: str) -> list[A2UIComponent]:
     content_lower = markdown_content.lower()
 
     # Simple entity extraction
-    tech_patterns = ['React', 'Vue', 'Python', 'JavaScript', 'TypeScript', 'Docker', 'Kubernetes', 'AWS', 'Azure']
-    for tech in tech_patterns:
+    for tech in _ORCHESTRATOR_TECH_PATTERNS:
         if tech.lower() in content_lower:
             entities['technologies'].append(tech)
 
@@ -5145,8 +5171,12 @@ def orchestrate_dashboard(markdown_content: str) -> list[A2UIComponent]:
 
     # Generate TLDR for long content
     if len(markdown_content) > 500:
-        lines = [line.strip() for line in markdown_content.split('\n')
-                if line.strip() and not line.startswith('#')]
+        # Lazily walk lines and stop after the first 3 non-heading lines
+        lines = list(islice(
+            (stripped for line in io.StringIO(markdown_content)
+             if (stripped := line.strip()) and not line.startswith('#')),
+            3
+        ))
         summary_text = ' '.join(lines[:3]) if lines else "Summary of document content"
 
         # Truncate to 300 chars to meet generate_tldr validation
@@ -5186,9 +5216,8 @@ def orchestrate_dashboard(markdown_content: str) -> list[A2UIComponent]:
                 )
                 add_component_with_variety(table)
 
-        # Stat cards
-        import re
-        numbers = re.findall(r'\b\d+[%]?\b', markdown_content)
+        # Stat cards - only the first two numbers are used, so stop scanning there
+        numbers = [m.group(0) for m in islice(_NUMBER_TOKEN_REGEX.finditer(markdown_content), 2)]
         if len(numbers) >= 2:
             stat1 = generate_stat_card(
                 title="Key Metric",
@@ -5216,9 +5245,9 @@ def orchestrate_dashboard(markdown_content: str) -> list[A2UIComponent]:
     # Add resources from links
     if content_analysis.github_links:
         for github_url in content_analysis.github_links[:2]:
-            # Extract repo name from URL
-            repo_parts = github_url.rstrip('/').split('/')
-            repo_name = repo_parts[-1] if len(repo_parts) > 0 else "Repository"
+            # Extract owner/repo from the last two path segments (ignores ?query and #fragment)
+            repo_parts = urlsplit(github_url).path.strip('/').rsplit('/', 2)
+            repo_name = repo_parts[-1] or "Repository"
             owner = repo_parts[-2] if len(repo_parts) > 1 else None
             repo = generate_repo_card(
                 name=repo_name,
@@ -5229,9 +5258,11 @@ def orchestrate_dashboard(markdown_content: str) -> list[A2UIComponent]:
 
     # Add general links
     if content_analysis.links:
-        other_links = [link for link in content_analysis.links
-                      if 'github.com' not in link and 'youtube.com' not in link]
-        for link in other_links[:2]:
+        other_links = (
+            link for link in content_analysis.links
+            if not any(host in link for host in _ORCHESTRATOR_EXCLUDED_LINK_HOSTS)
+        )
+        for link in islice(other_links, 2):
             link_card = generate_link_card(
                 url=link,
                 title=f"Resource: {link[:30]}..."
@@ -5241,7 +5272,7 @@ def orchestrate_dashboard(markdown_content: str) -> list[A2UIComponent]:
     # Add table of contents
     if len(content_analysis.sections) > 3:
         toc_items = [{"title": section, "anchor": f"#{section.lower().replace(' ', '-')}"}
-                    for section in content_analysis.sections[:8]]
+                     for section in islice(content_analysis.sections, 8)]
         toc = generate_table_of_contents(items=toc_items)
         add_component_with_variety(toc)
 
@@ -5251,34 +5282,35 @@ def orchestrate_dashboard(markdown_content: str) -> list[A2UIComponent]:
             tag = generate_tag(label=tag_text, type="primary")
             add_component_with_variety(tag)
 
-    # Ensure minimum 4 different component types
-    while len(component_types_used) < 4:
-        if 'a2ui.KeyTakeaways' not in component_types_used:
-            items = content_analysis.sections[:3] if content_analysis.sections else ["Key point 1", "Key point 2"]
-            takeaways = generate_key_takeaways(items=items)
-            components.append(takeaways)
-            component_types_used.add(takeaways.type)
-        elif 'a2ui.Badge' not in component_types_used:
-            badge = generate_badge(label=document_type.title(), count=1)
-            components.append(badge)
-            component_types_used.add(badge.type)
-        elif 'a2ui.BulletPoint' not in component_types_used:
-            bullet = generate_bullet_point(text="Additional detail")
-            components.append(bullet)
-            component_types_used.add(bullet.type)
-        else:
-            # Add extra callout
-            callout = generate_callout_card(
-                type="info",
-                title="Note",
-                content="Important information"
-            )
-            components.append(callout)
-            component_types_used.add(callout.type)
-            break
+    # Ensure minimum 4 different component types, adding fillers in a fixed order
+    if len(component_types_used) < 4 and 'a2ui.KeyTakeaways' not in component_types_used:
+        items = content_analysis.sections[:3] if content_analysis.sections else ["Key point 1", "Key point 2"]
+        takeaways = generate_key_takeaways(items=items)
+        components.append(takeaways)
+        component_types_used.add(takeaways.type)
+
+    if len(component_types_used) < 4 and 'a2ui.Badge' not in component_types_used:
+        badge = generate_badge(label=document_type.title(), count=1)
+        components.append(badge)
+        component_types_used.add(badge.type)
+
+    if len(component_types_used) < 4 and 'a2ui.BulletPoint' not in component_types_used:
+        bullet = generate_bullet_point(text="Additional detail")
+        components.append(bullet)
+        component_types_used.add(bullet.type)
+
+    if len(component_types_used) < 4:
+        # Add extra callout
+        callout = generate_callout_card(
+            type="info",
+            title="Note",
+            content="Important information"
+        )
+        components.append(callout)
+        component_types_used.add(callout.type)
 
     # Ensure minimum 4 components
-    while len(components) < 4:
+    for _ in range(4 - len(components)):
         filler = generate_callout_card(
             type="info",
             title=f"Section {len(components) + 1}",
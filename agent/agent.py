@@ -6,6 +6,8 @@ via the AG-UI protocol, enabling seamless CopilotKit integration.
 """
 
 import os
+import asyncio
+import logging
 from typing import Any
 from uuid import uuid4
 from datetime import datetime
@@ -15,12 +17,22 @@ from pydantic import BaseModel, Field
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.ag_ui import StateDeps
 from pydantic_ai.models.openai import OpenAIModel
-from ag_ui.core import EventType, StateSnapshotEvent
+from pydantic_ai.providers.openrouter import OpenRouterProvider
+from ag_ui.core import EventType, StateDeltaEvent, StateSnapshotEvent
+
+from llm_orchestrator import get_http_client
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
+# Per-component diagnostics log at DEBUG; tool start/finish lines are still printed
+logger = logging.getLogger(__name__)
+
+# OpenRouter configuration, read once at import
+OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", "anthropic/claude-sonnet-4")
+
 
 class DashboardState(BaseModel):
     """
@@ -29,6 +41,9 @@ class DashboardState(BaseModel):
     This state is synchronized bidirectionally via AG-UI protocol.
     The frontend can read and update this state, and the agent
     can emit StateSnapshot events to update it.
+
+    Must remain a Pydantic BaseModel: StateDeps and the AG-UI adapter validate
+    incoming frontend state through the model's Pydantic schema.
     """
     # Document info
     markdown_content: str = ""
@@ -56,33 +71,53 @@ class DashboardState(BaseModel):
 
 def create_openrouter_model() -> OpenAIModel:
     """Create OpenRouter model instance."""
-    api_key = os.getenv("OPENROUTER_API_KEY")
-    if not api_key:
+    if not OPENROUTER_API_KEY:
         raise ValueError("OPENROUTER_API_KEY environment variable required")
 
-    model_name = os.getenv("OPENROUTER_MODEL", "anthropic/claude-sonnet-4")
-    return OpenAIModel(model_name, provider='openrouter')
+    # Share call_llm's keep-alive pool so the backend holds one pool per OpenRouter host
+    provider = OpenRouterProvider(api_key=OPENROUTER_API_KEY, http_client=get_http_client())
+    return OpenAIModel(OPENROUTER_MODEL, provider=provider)
+
+
+def _activity_entry(message: str, status: str) -> dict[str, Any]:
+    """Build an activity log entry for frontend rendering."""
+    return {
+        "id": uuid4().hex,
+        "message": message,
+        "timestamp": datetime.now().isoformat(),
+        "status": status,
+    }
+
+
+# A2UIComponent fields synced to the frontend in state.components
+COMPONENT_STATE_FIELDS = frozenset({"type", "id", "props", "layout", "zone"})
+
+
+# Static system prompt. Keep it free of per-request values (timestamps, IDs,
+# document content) so it stays a stable, cacheable prompt prefix; dynamic
+# context belongs in user messages or tool results instead.
+SYSTEM_PROMPT = dedent("""
+    You are a specialized AI assistant that transforms Markdown research documents
+    into interactive dashboard components.
+
+    Your workflow:
+    1. Analyze the markdown content to understand its structure and type
+    2. Generate A2UI dashboard components that best represent the information
+
+    When the user provides markdown content:
+    1. First call analyze_content() to understand and classify the document
+    2. Then call generate_components() to create the UI components
+
+    Always explain what you're doing as you work. The user can see the dashboard
+    being built in real-time as you generate components.
+""").strip()
 
 
 # Create the agent with StateDeps for AG-UI integration
 agent = Agent(
     model=create_openrouter_model(),
     deps_type=StateDeps[DashboardState],
-    system_prompt=dedent("""
-        You are a specialized AI assistant that transforms Markdown research documents
-        into interactive dashboard components.
-
-        Your workflow:
-        1. Analyze the markdown content to understand its structure and type
-        2. Generate A2UI dashboard components that best represent the information
-
-        When the user provides markdown content:
-        1. First call analyze_content() to understand and classify the document
-        2. Then call generate_components() to create the UI components
-
-        Always explain what you're doing as you work. The user can see the dashboard
-        being built in real-time as you generate components.
-    """).strip()
+    system_prompt=SYSTEM_PROMPT,
 )
 
 
@@ -100,7 +135,7 @@ async def analyze_content(ctx: RunContext[StateDeps[DashboardState]]) -> StateSn
     Analyze the markdown content to determine document type and extract key elements.
     Updates the shared state with analysis results.
     """
-    from content_analyzer import parse_markdown
+    from content_analyzer import parse_markdown_cached
     from llm_orchestrator import analyze_content_with_llm
 
     state = ctx.deps.state
@@ -112,18 +147,13 @@ async def analyze_content(ctx: RunContext[StateDeps[DashboardState]]) -> StateSn
     state.status = "analyzing"
     state.progress = 20
     state.current_step = "Analyzing document structure..."
-    state.activity_log.append({
-        "id": str(uuid4()),
-        "message": "Starting content analysis",
-        "timestamp": datetime.now().isoformat(),
-        "status": "in_progress"
-    })
-
-    # Parse markdown structure
-    parsed = parse_markdown(markdown)
+    state.activity_log.append(_activity_entry("Starting content analysis", "in_progress"))
 
-    # Get LLM analysis
-    analysis = await analyze_content_with_llm(markdown)
+    # Parse markdown structure off the event loop while the LLM analysis runs
+    parsed, analysis = await asyncio.gather(
+        asyncio.to_thread(parse_markdown_cached, markdown),
+        analyze_content_with_llm(markdown),
+    )
 
     # Update state with results
     state.document_title = parsed.get("title", "Untitled")
@@ -134,12 +164,7 @@ async def analyze_content(ctx: RunContext[StateDeps[DashboardState]]) -> StateSn
     }
     state.progress = 40
     state.current_step = f"Document classified as: {state.document_type}"
-    state.activity_log.append({
-        "id": str(uuid4()),
-        "message": f"Analysis complete: {state.document_type}",
-        "timestamp": datetime.now().isoformat(),
-        "status": "completed"
-    })
+    state.activity_log.append(_activity_entry(f"Analysis complete: {state.document_type}", "completed"))
 
     print(f"[TOOL] analyze_content: document_type={state.document_type}")
 
@@ -151,10 +176,11 @@ async def analyze_content(ctx: RunContext[StateDeps[DashboardState]]) -> StateSn
 
 
 @agent.tool
-async def generate_components(ctx: RunContext[StateDeps[DashboardState]]) -> StateSnapshotEvent:
+async def generate_components(ctx: RunContext[StateDeps[DashboardState]]) -> StateDeltaEvent:
     """
     Generate A2UI dashboard components based on the analyzed content.
-    Each component is added to state and synced with the frontend.
+    Each component is added to state and synced with the frontend as a
+    JSON Patch delta, so the document and analysis are not re-sent.
     """
     from llm_orchestrator import orchestrate_dashboard_with_llm
 
@@ -168,43 +194,41 @@ async def generate_components(ctx: RunContext[StateDeps[DashboardState]]) -> Sta
     state.progress = 50
     state.components = []  # Clear existing
 
+    # JSON Patch ops mirroring the state mutations below
+    delta: list[dict[str, Any]] = [{"op": "replace", "path": "/components", "value": []}]
+
     # Generate components using the orchestrator
     component_count = 0
     async for component in orchestrate_dashboard_with_llm(state.markdown_content):
         component_count += 1
 
-        # Convert component to dict
-        component_dict = {
-            "type": component.type,
-            "id": component.id,
-            "props": component.props,
-        }
-        if component.layout:
-            component_dict["layout"] = component.layout
-        if component.zone:
-            component_dict["zone"] = component.zone
+        # Convert component to dict in a single serializer pass
+        component_dict = component.model_dump(include=COMPONENT_STATE_FIELDS, exclude_none=True)
 
         state.components.append(component_dict)
+        delta.append({"op": "add", "path": "/components/-", "value": component_dict})
         state.progress = min(50 + (component_count * 3), 95)
         state.current_step = f"Generated {component.type}"
 
-        print(f"[TOOL] generate_components: added {component.type}")
+        logger.debug("[TOOL] generate_components: added %s", component.type)
 
     # Final status
     state.status = "complete"
     state.progress = 100
     state.current_step = "Dashboard complete!"
-    state.activity_log.append({
-        "id": str(uuid4()),
-        "message": f"Generated {component_count} components",
-        "timestamp": datetime.now().isoformat(),
-        "status": "completed"
-    })
+    activity = _activity_entry(f"Generated {component_count} components", "completed")
+    state.activity_log.append(activity)
+    delta.extend((
+        {"op": "replace", "path": "/status", "value": state.status},
+        {"op": "replace", "path": "/progress", "value": state.progress},
+        {"op": "replace", "path": "/current_step", "value": state.current_step},
+        {"op": "add", "path": "/activity_log/-", "value": activity},
+    ))
 
     print(f"[TOOL] generate_components: complete with {component_count} components")
 
-    # Return StateSnapshotEvent to sync final state with frontend
-    return StateSnapshotEvent(
-        type=EventType.STATE_SNAPSHOT,
-        snapshot=state,
+    # Return StateDeltaEvent to sync the changes with the frontend
+    return StateDeltaEvent(
+        type=EventType.STATE_DELTA,
+        delta=delta,
     )
@@ -5,7 +5,11 @@ This module provides comprehensive parsing and analysis of Markdown documents,
 extracting structured information, links, code blocks, tables, and entities.
 """
 
+import hashlib
 import re
+import threading
+from collections import OrderedDict
+from itertools import islice
 from typing import Any
 from pydantic import BaseModel, Field
 
@@ -94,6 +98,23 @@ MARKDOWN_LINK_REGEX = re.compile(
     re.IGNORECASE
 )
 
+# Classification keywords per category, matched as substrings of the lowercased document
+TUTORIAL_KEYWORDS = ('step', 'tutorial', 'how to', 'guide', 'lesson', 'walkthrough')
+RESEARCH_KEYWORDS = ('abstract', 'methodology', 'results', 'conclusion', 'references', 'citation')
+TECH_DOC_KEYWORDS = ('api', 'endpoint', 'parameter', 'function', 'class', 'method')
+
+# Any header level, capturing the hashes and the header text
+HEADER_REGEX = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
+
+# Fenced code block with optional language specifier
+CODE_BLOCK_REGEX = re.compile(r'```(\w*)\n(.*?)```', re.DOTALL)
+
+# Simple table detection: header row, separator row, then data rows
+TABLE_REGEX = re.compile(
+    r'(\|.+\|[\r\n]+\|[-:\s|]+\|[\r\n]+(?:\|.+\|[\r\n]+)*)',
+    re.MULTILINE
+)
+
 
 def parse_markdown(content: str) -> dict[str, Any]:
     """
@@ -125,49 +146,45 @@ def parse_markdown(content: str) -> dict[str, Any]:
         'tables': []
     }
 
-    # Extract title (first H1 header)
-    title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
-    if title_match:
-        result['title'] = title_match.group(1).strip()
+    # Extract all headers (sections) and the title (first H1 header) in one walk
+    title = None
+    for match in HEADER_REGEX.finditer(content):
+        hashes, header_text = match.groups()
+        header_text = header_text.strip()
+        result['sections'].append(header_text)
+        if title is None and hashes == '#':
+            title = header_text
+
+    if title is not None:
+        result['title'] = title
     else:
         # Fallback: use first line or "Untitled"
-        first_line = content.split('\n')[0].strip() if content else ''
+        first_line = content.partition('\n')[0].strip() if content else ''
         result['title'] = first_line[:100] if first_line else 'Untitled Document'
 
-    # Extract all headers (sections)
-    header_pattern = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
-    headers = header_pattern.findall(content)
-    result['sections'] = [header[1].strip() for header in headers]
-
     # Extract all links (from Markdown syntax [text](url))
     markdown_links = MARKDOWN_LINK_REGEX.findall(content)
     for text, url in markdown_links:
         result['all_links'].append(url.strip())
 
-    # Also extract plain URLs in text
-    plain_urls = URL_REGEX.findall(content)
-    for url in plain_urls:
+    # Also extract plain URLs in text (set lookup instead of rescanning the list)
+    seen_links = set(result['all_links'])
+    for url in URL_REGEX.findall(content):
         cleaned_url = url.strip()
-        if cleaned_url not in result['all_links']:
+        if cleaned_url not in seen_links:
+            seen_links.add(cleaned_url)
             result['all_links'].append(cleaned_url)
 
-    # Extract YouTube links
-    youtube_matches = YOUTUBE_LINK_REGEX.finditer(content)
-    for match in youtube_matches:
-        youtube_url = match.group(0)
-        if youtube_url not in result['youtube_links']:
-            result['youtube_links'].append(youtube_url)
-
-    # Extract GitHub links
-    github_matches = GITHUB_LINK_REGEX.finditer(content)
-    for match in github_matches:
-        github_url = match.group(0)
-        if github_url not in result['github_links']:
-            result['github_links'].append(github_url)
+    # Extract YouTube and GitHub links, deduplicated in first-seen order
+    result['youtube_links'] = list(dict.fromkeys(
+        match.group(0) for match in YOUTUBE_LINK_REGEX.finditer(content)
+    ))
+    result['github_links'] = list(dict.fromkeys(
+        match.group(0) for match in GITHUB_LINK_REGEX.finditer(content)
+    ))
 
     # Extract code blocks with language specification
-    code_block_pattern = re.compile(r'```(\w*)\n(.*?)```', re.DOTALL)
-    code_matches = code_block_pattern.findall(content)
+    code_matches = CODE_BLOCK_REGEX.findall(content)
     for language, code in code_matches:
         result['code_blocks'].append({
             'language': language.strip() if language else 'text',
@@ -175,12 +192,7 @@ def parse_markdown(content: str) -> dict[str, Any]:
         })
 
     # Extract tables (Markdown table syntax)
-    # Simple table detection: lines with | separators
-    table_pattern = re.compile(
-        r'(\|.+\|[\r\n]+\|[-:\s|]+\|[\r\n]+(?:\|.+\|[\r\n]+)*)',
-        re.MULTILINE
-    )
-    table_matches = table_pattern.findall(content)
+    table_matches = TABLE_REGEX.findall(content)
 
     for table_text in table_matches:
         lines = [line.strip() for line in table_text.strip().split('\n') if line.strip()]
@@ -205,6 +217,42 @@ def parse_markdown(content: str) -> dict[str, Any]:
     return result
 
 
+# LRU cache of parse_markdown results keyed by a BLAKE2b digest of the content,
+# so cached documents are not retained as dictionary keys
+PARSE_CACHE_SIZE = 64
+_parse_cache: OrderedDict[bytes, dict[str, Any]] = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def parse_markdown_cached(content: str) -> dict[str, Any]:
+    """
+    Memoized parse_markdown for documents that are parsed repeatedly.
+
+    Results are cached by content digest, so replaying the same document skips
+    the structural parse. The returned dictionary is shared between callers
+    and must be treated as read-only.
+
+    Args:
+        content: Raw Markdown content as string
+
+    Returns:
+        Parsed structure as returned by parse_markdown
+    """
+    key = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+    with _parse_cache_lock:
+        parsed = _parse_cache.get(key)
+        if parsed is not None:
+            _parse_cache.move_to_end(key)
+            return parsed
+
+    parsed = parse_markdown(content)
+    with _parse_cache_lock:
+        _parse_cache[key] = parsed
+        if len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return parsed
+
+
 async def analyze_content(markdown: str, agent) -> ContentAnalysis:
     """
     Analyze Markdown content using LLM-based classification and entity extraction.
@@ -305,18 +353,15 @@ def _classify_heuristic(markdown: str, parsed: dict[str, Any]) -> str:
     content_lower = markdown.lower()
 
     # Check for tutorial indicators
-    tutorial_keywords = ['step', 'tutorial', 'how to', 'guide', 'lesson', 'walkthrough']
-    if any(keyword in content_lower for keyword in tutorial_keywords):
+    if any(keyword in content_lower for keyword in TUTORIAL_KEYWORDS):
         return 'tutorial'
 
     # Check for research indicators
-    research_keywords = ['abstract', 'methodology', 'results', 'conclusion', 'references', 'citation']
-    if any(keyword in content_lower for keyword in research_keywords):
+    if any(keyword in content_lower for keyword in RESEARCH_KEYWORDS):
         return 'research'
 
     # Check for technical documentation
-    tech_doc_keywords = ['api', 'endpoint', 'parameter', 'function', 'class', 'method']
-    if any(keyword in content_lower for keyword in tech_doc_keywords) and len(parsed['code_blocks']) >= 2:
+    if len(parsed['code_blocks']) >= 2 and any(keyword in content_lower for keyword in TECH_DOC_KEYWORDS):
         return 'technical_doc'
 
     # Check for code-heavy content (guides)
@@ -392,10 +437,8 @@ def _extract_entities(markdown: str) -> dict[str, list[str]]:
                 entities['languages'].append(lang)
 
     # Extract concepts from headers
-    header_pattern = re.compile(r'^#{1,6}\s+(.+)$', re.MULTILINE)
-    headers = header_pattern.findall(markdown)
-    for header in headers[:10]:  # Top 10 headers as concepts
-        cleaned = header.strip()
+    for match in islice(HEADER_REGEX.finditer(markdown), 10):  # Top 10 headers as concepts
+        cleaned = match.group(2).strip()
         if len(cleaned) > 3 and cleaned not in entities['concepts']:
             entities['concepts'].append(cleaned)
 
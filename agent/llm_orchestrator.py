@@ -8,8 +8,13 @@ on the content analysis.
 
 import os
 import json
+import logging
 import re
-from typing import AsyncGenerator
+import sys
+import hashlib
+import traceback
+from collections import OrderedDict
+from typing import AsyncGenerator, Callable, Iterator
 import httpx
 from dotenv import load_dotenv
 
@@ -19,6 +24,8 @@ from a2ui_generator import (
     generate_id,
     reset_id_counter,
     VALID_COMPONENT_TYPES,
+    TIMELINE_EVENT_TYPES,
+    URL_SCHEMES,
     is_valid_external_url,
     # Component generators
     generate_tldr,
@@ -54,8 +61,17 @@ from a2ui_generator import (
     generate_book_card,
     generate_timeline_event,
 )
-from content_analyzer import parse_markdown, ContentAnalysis, _classify_heuristic
+from content_analyzer import (
+    parse_markdown_cached,
+    ContentAnalysis,
+    HEADER_REGEX,
+    _classify_heuristic,
+    _extract_entities,
+)
 from prompts import (
+    CONTENT_ANALYSIS_PREFIX,
+    LAYOUT_SELECTION_PREFIX,
+    COMPONENT_SELECTION_PREFIX,
     format_content_analysis_prompt,
     format_layout_selection_prompt,
     format_component_selection_prompt,
@@ -65,10 +81,32 @@ from prompts import (
 # Load environment variables
 load_dotenv()
 
+# Per-component diagnostics go through this logger at DEBUG level, so they cost
+# nothing unless enabled; stage-level progress and errors are still printed
+logger = logging.getLogger(__name__)
+
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 OPENROUTER_MODEL = os.getenv("OPENROUTER_MODEL", "anthropic/claude-haiku-4.5")
+# Smaller model for classification-grade calls (content analysis, layout selection)
+OPENROUTER_FAST_MODEL = os.getenv("OPENROUTER_FAST_MODEL", OPENROUTER_MODEL)
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
+# Documents shorter than this are classified locally instead of by the LLM
+LLM_ANALYSIS_MIN_CHARS = int(os.getenv("LLM_ANALYSIS_MIN_CHARS", "2000"))
+
+# In-memory LRU of LLM responses keyed by a digest of the full request, so
+# regenerating an unchanged document skips the network round trips
+LLM_CACHE_SIZE = 32
+LLM_CACHE_DISABLED = os.getenv("LLM_CACHE_DISABLED") == "1"
+_llm_cache: OrderedDict[bytes, str] = OrderedDict()
+
+# OpenRouter model prefixes that need an explicit cache_control breakpoint for
+# provider-side prompt caching (other providers cache shared prefixes automatically)
+PROMPT_CACHE_MODEL_PREFIXES = ("anthropic/",)
+
+# Shared OpenRouter client, created on first use so pipeline stages reuse connections
+_http_client: httpx.AsyncClient | None = None
+
 # Default semantic zones for each component type
 # These are used when the LLM doesn't specify a zone
 COMPONENT_DEFAULT_ZONES = {
@@ -183,8 +221,69 @@ COMPONENT_DEFAULT_WIDTHS = {
     "TimelineEvent": "full",
 }
 
+# Lowercase view of the zone defaults for case-insensitive type lookups
+COMPONENT_DEFAULT_ZONES_LOWER = {
+    key.lower(): value for key, value in COMPONENT_DEFAULT_ZONES.items()
+}
+
 
-async def call_llm(prompt: str, system_prompt: str = "", max_tokens: int = 4000, temperature: float = 0.7) -> str:
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared OpenRouter client, creating it on first use.
+
+    call_llm and the agent's pydantic_ai provider share this one pool.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            base_url=OPENROUTER_BASE_URL,
+            headers={
+                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+                "Content-Type": "application/json",
+                "HTTP-Referer": "http://localhost:3010",
+                "X-Title": "Second Brain Research Dashboard",
+            },
+            timeout=120.0,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared OpenRouter client, if one was created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+async def call_llm(
+    prompt: str,
+    system_prompt: str = "",
+    max_tokens: int = 4000,
+    temperature: float = 0.7,
+    model: str | None = None,
+    cache_prefix: str = ""
+) -> str:
+    """
+    Call OpenRouter LLM API with the given prompt and return the response text.
+
+    See call_llm_with_cache_key for the arguments.
+    """
+    content, _ = await call_llm_with_cache_key(
+        prompt, system_prompt, max_tokens, temperature, model, cache_prefix
+    )
+    return content
+
+
+async def call_llm_with_cache_key(
+    prompt: str,
+    system_prompt: str = "",
+    max_tokens: int = 4000,
+    temperature: float = 0.7,
+    model: str | None = None,
+    cache_prefix: str = ""
+) -> tuple[str, bytes | None]:
     """
     Call OpenRouter LLM API with the given prompt.
 
@@ -193,42 +292,70 @@ async def call_llm(prompt: str, system_prompt: str = "", max_tokens: int = 4000,
         system_prompt: Optional system prompt
         max_tokens: Maximum tokens in the response
         temperature: Sampling temperature (lower = more precise)
+        model: Optional model override (defaults to OPENROUTER_MODEL)
+        cache_prefix: Static leading part of the prompt, marked for provider-side
+            prompt caching on models that need an explicit breakpoint
 
     Returns:
-        The LLM response text
+        The LLM response text and its response cache key (None when caching
+        is disabled)
+
+    Successful responses are cached in memory unless LLM_CACHE_DISABLED=1.
+    Callers that cannot parse a response evict it with
+    _llm_cache.pop(cache_key, None), so a rerun samples again.
     """
     if not OPENROUTER_API_KEY:
         raise ValueError("OPENROUTER_API_KEY not set in environment")
 
+    model = model or OPENROUTER_MODEL
+
+    cache_key = None
+    if not LLM_CACHE_DISABLED:
+        request_key = "\0".join((model, system_prompt, prompt, str(temperature), str(max_tokens)))
+        cache_key = hashlib.blake2b(request_key.encode("utf-8"), digest_size=16).digest()
+        cached = _llm_cache.get(cache_key)
+        if cached is not None:
+            _llm_cache.move_to_end(cache_key)
+            logger.debug("[LLM] Cache hit")
+            return cached, cache_key
+
     messages = []
     if system_prompt:
         messages.append({"role": "system", "content": system_prompt})
-    messages.append({"role": "user", "content": prompt})
+    if cache_prefix and model.startswith(PROMPT_CACHE_MODEL_PREFIXES) and prompt.startswith(cache_prefix):
+        messages.append({"role": "user", "content": [
+            {"type": "text", "text": cache_prefix, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": prompt[len(cache_prefix):]},
+        ]})
+    else:
+        messages.append({"role": "user", "content": prompt})
+
+    response = await get_http_client().post(
+        "/chat/completions",
+        json={
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+    )
 
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        response = await client.post(
-            f"{OPENROUTER_BASE_URL}/chat/completions",
-            headers={
-                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "http://localhost:3010",
-                "X-Title": "Second Brain Research Dashboard",
-            },
-            json={
-                "model": OPENROUTER_MODEL,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-            }
-        )
+    if response.status_code != 200:
+        error_text = response.text
+        print(f"[LLM ERROR] Status {response.status_code}: {error_text}")
+        raise Exception(f"LLM API error: {response.status_code} - {error_text}")
+
+    result = response.json()
+    choice = result["choices"][0]
+    content = choice["message"]["content"]
 
-        if response.status_code != 200:
-            error_text = response.text
-            print(f"[LLM ERROR] Status {response.status_code}: {error_text}")
-            raise Exception(f"LLM API error: {response.status_code} - {error_text}")
+    # Don't cache truncated responses, so a rerun gets another chance at a complete one
+    if cache_key is not None and choice.get("finish_reason") == "stop":
+        _llm_cache[cache_key] = content
+        if len(_llm_cache) > LLM_CACHE_SIZE:
+            _llm_cache.popitem(last=False)
 
-        result = response.json()
-        return result["choices"][0]["message"]["content"]
+    return content, cache_key
 
 
 def extract_json_from_response(response: str) -> dict:
@@ -242,14 +369,19 @@ def extract_json_from_response(response: str) -> dict:
         Parsed JSON dictionary
     """
     # Try to find JSON in code blocks first
-    json_match = re.search(r'```(?:json)?\s*([\s\S]*?)```', response)
-    if json_match:
-        json_str = json_match.group(1).strip()
+    fence_start = response.find("```")
+    fence_end = response.find("```", fence_start + 3) if fence_start != -1 else -1
+    if fence_end != -1:
+        body_start = fence_start + 3
+        if response.startswith("json", body_start):
+            body_start += 4
+        json_str = response[body_start:fence_end].strip()
     else:
-        # Try to find raw JSON
-        json_match = re.search(r'\{[\s\S]*\}', response)
-        if json_match:
-            json_str = json_match.group(0)
+        # Try to find raw JSON, from the first opening to the last closing brace
+        start = response.find("{")
+        end = response.rfind("}")
+        if start != -1 and end > start:
+            json_str = response[start:end + 1]
         else:
             json_str = response
 
@@ -266,58 +398,49 @@ def extract_json_from_response(response: str) -> dict:
         return {}
 
 
+# Opening of the "components" array in a component selection response
+COMPONENTS_ARRAY_REGEX = re.compile(r'"components"\s*:\s*\[')
+
+# JSON string literals (matched whole, so braces inside them are skipped; an
+# unterminated string runs to the end of the input) or single braces
+JSON_BRACE_TOKEN_REGEX = re.compile(r'"(?:[^"\\]|\\.)*"?|[{}]', re.DOTALL)
+
+
 def _recover_truncated_components(json_str: str) -> list[dict]:
     """
     Recover individual component objects from a truncated JSON response.
     Finds the components array and extracts all complete JSON objects from it.
     """
     # Find the start of the components array
-    match = re.search(r'"components"\s*:\s*\[', json_str)
+    match = COMPONENTS_ARRAY_REGEX.search(json_str)
     if not match:
         return []
 
-    array_start = match.end()
     components = []
-    pos = array_start
+    pos = match.end()
 
     # Extract complete JSON objects one at a time
-    while pos < len(json_str):
+    while True:
         # Skip whitespace and commas
         while pos < len(json_str) and json_str[pos] in ' \t\n\r,':
             pos += 1
         if pos >= len(json_str) or json_str[pos] != '{':
             break
 
-        # Find the matching closing brace
+        # Find the matching closing brace, skipping over string literals whole
         depth = 0
-        start = pos
-        in_string = False
-        escape_next = False
-        for i in range(start, len(json_str)):
-            c = json_str[i]
-            if escape_next:
-                escape_next = False
-                continue
-            if c == '\\' and in_string:
-                escape_next = True
-                continue
-            if c == '"' and not escape_next:
-                in_string = not in_string
-                continue
-            if in_string:
-                continue
-            if c == '{':
+        for token in JSON_BRACE_TOKEN_REGEX.finditer(json_str, pos):
+            if token[0] == '{':
                 depth += 1
-            elif c == '}':
+            elif token[0] == '}':
                 depth -= 1
                 if depth == 0:
                     # Found complete object
                     try:
-                        obj = json.loads(json_str[start:i+1])
-                        components.append(obj)
+                        components.append(json.loads(json_str[pos:token.end()]))
                     except json.JSONDecodeError:
                         pass
-                    pos = i + 1
+                    pos = token.end()
                     break
         else:
             # Reached end without finding matching brace — truncated
@@ -326,6 +449,18 @@ def _recover_truncated_components(json_str: str) -> list[dict]:
     return components
 
 
+def _heuristic_analysis(markdown_content: str, reasoning: str) -> dict:
+    """Build a content analysis dictionary from the local heuristics, in the LLM's shape."""
+    parsed = parse_markdown_cached(markdown_content)
+    return {
+        "document_type": _classify_heuristic(markdown_content, parsed),
+        "title": parsed.get("title", "Untitled"),
+        "entities": _extract_entities(markdown_content),
+        "confidence": 0.5,
+        "reasoning": reasoning
+    }
+
+
 async def analyze_content_with_llm(markdown_content: str) -> dict:
     """
     Use LLM to analyze markdown content and classify it.
@@ -335,33 +470,37 @@ async def analyze_content_with_llm(markdown_content: str) -> dict:
 
     Returns:
         Content analysis dictionary
+
+    Documents shorter than LLM_ANALYSIS_MIN_CHARS skip the LLM call and use
+    the heuristic analysis directly.
     """
+    if len(markdown_content) < LLM_ANALYSIS_MIN_CHARS:
+        result = _heuristic_analysis(markdown_content, "Short document, heuristic analysis")
+        print(f"[LLM] Short document, skipped LLM analysis: {result['document_type']}")
+        return result
+
     system_prompt = """You are an expert content analyst. Analyze documents and return structured JSON.
 Always respond with valid JSON only, no additional text."""
 
     prompt = format_content_analysis_prompt(markdown_content)
 
     print(f"[LLM] Analyzing content... (prompt length: {len(prompt)} chars)")
+    cache_key = None
     try:
-        response = await call_llm(prompt, system_prompt)
+        response, cache_key = await call_llm_with_cache_key(
+            prompt, system_prompt, model=OPENROUTER_FAST_MODEL, cache_prefix=CONTENT_ANALYSIS_PREFIX
+        )
         print(f"[LLM] Analysis response received ({len(response)} chars)")
     except Exception as e:
         print(f"[LLM ERROR] Content analysis failed: {e}")
-        import traceback
         traceback.print_exc()
         response = ""
     result = extract_json_from_response(response)
 
     # Provide defaults if parsing failed
     if not result:
-        parsed = parse_markdown(markdown_content)
-        result = {
-            "document_type": _classify_heuristic(markdown_content, parsed),
-            "title": parsed.get("title", "Untitled"),
-            "entities": {"technologies": [], "tools": [], "languages": [], "concepts": []},
-            "confidence": 0.5,
-            "reasoning": "Fallback to heuristic analysis"
-        }
+        _llm_cache.pop(cache_key, None)
+        result = _heuristic_analysis(markdown_content, "Fallback to heuristic analysis")
 
     print(f"[LLM] Content analyzed: {result.get('document_type', 'unknown')}")
     return result
@@ -383,11 +522,14 @@ Always respond with valid JSON only, no additional text."""
     prompt = format_layout_selection_prompt(content_analysis)
 
     print("[LLM] Selecting layout...")
-    response = await call_llm(prompt, system_prompt)
+    response, cache_key = await call_llm_with_cache_key(
+        prompt, system_prompt, model=OPENROUTER_FAST_MODEL, cache_prefix=LAYOUT_SELECTION_PREFIX
+    )
     result = extract_json_from_response(response)
 
     # Provide defaults if parsing failed
     if not result or "layout_type" not in result:
+        _llm_cache.pop(cache_key, None)
         result = {
             "layout_type": "summary_layout",
             "confidence": 0.5,
@@ -400,6 +542,72 @@ Always respond with valid JSON only, no additional text."""
     return result
 
 
+# Appended where a section's body was shortened by _pack_markdown_by_sections
+SECTION_TRUNCATED_MARKER = "\n[... section truncated ...]\n\n"
+
+
+def _pack_markdown_by_sections(markdown_content: str, max_chars: int) -> str:
+    """
+    Shorten a document to at most max_chars while keeping every section.
+
+    Each section keeps its header line and a share of its body proportional to
+    its length, cut at a word boundary, so later sections aren't dropped the
+    way a plain prefix slice would drop them. The share is the largest one
+    whose packed output, headers and truncation markers included, fits the
+    budget. A body is kept whole when cutting it would save less than the
+    marker adds. If even the headers alone don't fit, the result is cut hard.
+
+    Args:
+        markdown_content: Raw markdown content
+        max_chars: Character budget for the packed document
+
+    Returns:
+        The original content if it fits, otherwise the packed document
+    """
+    if len(markdown_content) <= max_chars:
+        return markdown_content
+
+    header_starts = [match.start() for match in HEADER_REGEX.finditer(markdown_content)]
+    header_set = set(header_starts)
+    bounds = header_starts if header_starts and header_starts[0] == 0 else [0, *header_starts]
+    bounds.append(len(markdown_content))
+
+    sections = []
+    for start, end in zip(bounds, bounds[1:]):
+        section = markdown_content[start:end]
+        # Always keep a section's header line; preamble before the first header has none
+        header_end = (section.find("\n") + 1 or len(section)) if start in header_set else 0
+        sections.append((section[:header_end], section[header_end:]))
+
+    marker_len = len(SECTION_TRUNCATED_MARKER)
+
+    def pack(ratio: float) -> str:
+        parts = []
+        for header, body in sections:
+            budget = int(len(body) * ratio)
+            if len(body) - budget <= marker_len:
+                parts.append(header + body)
+                continue
+            cut = body.rfind(" ", 0, budget)
+            if cut <= 0:
+                cut = budget
+            parts.append(header + body[:cut].rstrip() + SECTION_TRUNCATED_MARKER)
+        return "".join(parts)
+
+    # Bisect for the largest body ratio whose packed output fits
+    low, high = 0.0, 1.0
+    packed = pack(low)
+    for _ in range(16):
+        mid = (low + high) / 2
+        candidate = pack(mid)
+        if len(candidate) <= max_chars:
+            low, packed = mid, candidate
+        else:
+            high = mid
+
+    return packed[:max_chars]
+
+
 async def select_components_with_llm(
     content_analysis: dict,
     layout_decision: dict,
@@ -426,16 +634,17 @@ RULES:
 4. Match component types to content: quotes->QuoteCard, news stories->HeadlineCard, stats->StatCard, events->TimelineEvent.
 5. For documents with 5+ sections, generate 15-25 components."""
 
-    prompt = format_component_selection_prompt(content_analysis, layout_decision)
+    selection_prompt = format_component_selection_prompt(content_analysis, layout_decision)
 
-    # Add full document content for the LLM to use (up to 30k chars)
-    content_limit = 30000
-    if len(markdown_content) > content_limit:
-        doc_content = markdown_content[:content_limit] + "\n\n[... content truncated ...]"
-    else:
-        doc_content = markdown_content
+    # (document chars, temperature, max tokens) per attempt. An unparseable
+    # response is retried once with a shorter document and lower temperature,
+    # reusing the analysis and layout instead of rerunning the whole pipeline.
+    attempts = ((30000, 0.4, 16000), (15000, 0.1, 20000))
+    for attempt, (content_limit, temperature, max_tokens) in enumerate(attempts, start=1):
+        # Add document content for the LLM to use (covering every section)
+        doc_content = _pack_markdown_by_sections(markdown_content, content_limit)
 
-    prompt += f"""
+        prompt = selection_prompt + f"""
 
 ## Actual Document Content (use this to populate component props)
 
@@ -445,23 +654,27 @@ CRITICAL: You must generate components covering ALL sections and topics above, n
 Extract REAL data from the document to populate component props.
 Return JSON with "components" array."""
 
-    import sys
-    print(f"[LLM] Selecting components... (prompt length: {len(prompt)} chars)", flush=True)
-    try:
-        response = await call_llm(prompt, system_prompt, max_tokens=16000, temperature=0.4)
-        print(f"[LLM] Response received ({len(response)} chars)", flush=True)
-    except Exception as e:
-        print(f"[LLM ERROR] Component selection LLM call failed: {e}", file=sys.stderr, flush=True)
-        import traceback
-        traceback.print_exc()
-        raise
+        print(f"[LLM] Selecting components... (attempt {attempt}, prompt length: {len(prompt)} chars)", flush=True)
+        try:
+            response, cache_key = await call_llm_with_cache_key(
+                prompt, system_prompt, max_tokens=max_tokens, temperature=temperature,
+                cache_prefix=COMPONENT_SELECTION_PREFIX,
+            )
+            print(f"[LLM] Response received ({len(response)} chars)", flush=True)
+        except Exception as e:
+            print(f"[LLM ERROR] Component selection LLM call failed: {e}", file=sys.stderr, flush=True)
+            traceback.print_exc()
+            raise
 
-    result = extract_json_from_response(response)
+        result = extract_json_from_response(response)
 
-    components = result.get("components", [])
+        components = result.get("components", [])
+        if components:
+            break
 
-    if not components:
-        print(f"[LLM ERROR] No components parsed. Response first 1000 chars:\n{response[:1000]}", file=sys.stderr, flush=True)
+        _llm_cache.pop(cache_key, None)
+        print(f"[LLM ERROR] No components parsed (attempt {attempt}). Response first 1000 chars:\n{response[:1000]}", file=sys.stderr, flush=True)
+    else:
         raise ValueError(f"LLM returned no components. Parsed keys: {list(result.keys())}. Response length: {len(response)}. First 200 chars: {response[:200]}")
 
     # Validate variety
@@ -504,30 +717,26 @@ def apply_layout_and_zone(component: A2UIComponent, spec: dict) -> A2UIComponent
     # Check for explicit zone in spec
     explicit_zone = spec.get("zone")
 
-    # Case-insensitive lookup for zone defaults
-    # Build a lowercase mapping for robust lookups
-    zone_lookup_key = component_type
-    default_zone = COMPONENT_DEFAULT_ZONES.get(zone_lookup_key)
-
-    # If not found, try case-insensitive lookup
+    # Exact lookup for zone defaults, then case-insensitive
+    default_zone = COMPONENT_DEFAULT_ZONES.get(component_type)
     if default_zone is None:
-        lower_key = component_type.lower()
-        for key, value in COMPONENT_DEFAULT_ZONES.items():
-            if key.lower() == lower_key:
-                default_zone = value
-                print(f"[ZONE] Case-insensitive match: '{component_type}' → '{key}' → zone='{value}'")
-                break
+        default_zone = COMPONENT_DEFAULT_ZONES_LOWER.get(component_type.lower())
+        if default_zone is not None:
+            logger.debug("[ZONE] Case-insensitive match: %r → zone=%r", component_type, default_zone)
 
     # Final fallback to "content"
     if default_zone is None:
         default_zone = "content"
-        print(f"[ZONE] No default zone for '{component_type}', using 'content'")
+        logger.debug("[ZONE] No default zone for %r, using 'content'", component_type)
 
     # Use explicit zone or fall back to default
     zone = explicit_zone or default_zone
 
     # Debug logging for zone assignment
-    print(f"[ZONE] {component_type}: explicit_zone={explicit_zone!r}, default={default_zone}, final={zone}")
+    logger.debug(
+        "[ZONE] %s: explicit_zone=%r, default=%s, final=%s",
+        component_type, explicit_zone, default_zone, zone,
+    )
 
     # Apply the zone
     component.zone = zone
@@ -535,20 +744,33 @@ def apply_layout_and_zone(component: A2UIComponent, spec: dict) -> A2UIComponent
     return component
 
 
-def expand_component_specs(specs: list[dict]) -> list[dict]:
+def expand_component_specs(specs: list[dict]) -> Iterator[dict]:
     """
     Expand component specs that contain batched items into individual specs.
 
     This handles ProConItem specs that have multiple items in an 'items' array,
-    converting them into individual specs for each item.
+    converting them into individual specs for each item. Specs are yielded
+    lazily so they can be built as they are expanded, and exact duplicates
+    (same type and props) are dropped.
 
     Args:
         specs: List of component specifications
 
-    Returns:
-        Expanded list with batched items converted to individual specs
+    Yields:
+        Component specs, with batched items converted to individual specs
     """
-    expanded = []
+    seen: set[tuple[str, str]] = set()
+
+    def first_occurrence(candidate: dict) -> bool:
+        key = (
+            candidate.get("component_type", ""),
+            json.dumps(candidate.get("props", {}), sort_keys=True, default=str),
+        )
+        if key in seen:
+            logger.debug("[EXPAND] Dropping duplicate %s spec", key[0])
+            return False
+        seen.add(key)
+        return True
 
     for spec in specs:
         component_type = spec.get("component_type", "")
@@ -566,567 +788,637 @@ def expand_component_specs(specs: list[dict]) -> list[dict]:
                 if is_pro or is_con:
                     # Expand each item into its own ProConItem spec
                     for item in items:
-                        expanded.append({
+                        item_spec = {
                             "component_type": "ProConItem",
                             "priority": spec.get("priority", "medium"),
                             "props": {
                                 "type": "pro" if is_pro else "con",
                                 "label": item,
                             }
-                        })
+                        }
+                        if first_occurrence(item_spec):
+                            yield item_spec
                     continue
 
         # Keep spec as-is for all other cases
-        expanded.append(spec)
+        if first_occurrence(spec):
+            yield spec
 
-    return expanded
 
+_MISSING = object()
 
-def build_a2ui_component(spec: dict, content_analysis: dict) -> A2UIComponent | None:
-    """
-    Build an A2UIComponent from a specification dictionary.
 
-    Args:
-        spec: Component specification from LLM
-        content_analysis: Content analysis for fallback data
+def _first(props: dict, *keys: str, default=None):
+    """Return the value of the first key present in props, or the default."""
+    for key in keys:
+        value = props.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+    return default
 
-    Returns:
-        A2UIComponent instance or None if invalid
-    """
-    component_type = spec.get("component_type", "")
-    props = spec.get("props", {})
 
-    # Normalize component type - strip whitespace
-    component_type = component_type.strip()
+def _parse_numeric(value, default: float | None = None) -> float | None:
+    """Parse an LLM-provided number such as "+1,234%" into a float, or return the default."""
+    if value is None:
+        return default
+    # Strip thousands separators and sign/percent decorations before float()
+    value_str = str(value).replace(",", "").replace("%", "").replace("+", "").strip()
+    if not value_str:
+        return default
+    try:
+        return float(value_str)
+    except ValueError:
+        return default
 
-    # Case-insensitive type mapping for robust LLM output handling
-    # Maps lowercase versions to canonical PascalCase names
-    COMPONENT_TYPE_CANONICAL = {
-        "tldr": "TLDR",
-        "keytakeaways": "KeyTakeaways",
-        "statcard": "StatCard",
-        "codeblock": "CodeBlock",
-        "stepcard": "StepCard",
-        "calloutcard": "CalloutCard",
-        "videocard": "VideoCard",
-        "repocard": "RepoCard",
-        "linkcard": "LinkCard",
-        "datatable": "DataTable",
-        "headlinecard": "HeadlineCard",
-        "tableofcontents": "TableOfContents",
-        "quotecard": "QuoteCard",
-        "checklistitem": "ChecklistItem",
-        "bulletpoint": "BulletPoint",
-        "experttip": "ExpertTip",
-        "badge": "Badge",
-        "tag": "Tag",
-        "section": "Section",
-        "comparisontable": "ComparisonTable",
-        "trendindicator": "TrendIndicator",
-        "metricrow": "MetricRow",
-        "comparisonbar": "ComparisonBar",
-        "rankeditem": "RankedItem",
-        "proconitem": "ProConItem",
-        "accordion": "Accordion",
-        "executivesummary": "ExecutiveSummary",
-        "grid": "Grid",
-        "toolcard": "ToolCard",
-        "bookcard": "BookCard",
-        "taggroup": "TagGroup",
-        "tagcloud": "TagCloud",
-        "categorybadge": "CategoryBadge",
-        "statusindicator": "StatusIndicator",
-        "prioritybadge": "PriorityBadge",
-        "difficultybadge": "DifficultyBadge",
-        "profilecard": "ProfileCard",
-        "companycard": "CompanyCard",
-        "timelineevent": "TimelineEvent",
-    }
 
-    # Try to normalize type (handle various casing from LLM)
-    original_type = component_type
-    if component_type.lower() in COMPONENT_TYPE_CANONICAL:
-        component_type = COMPONENT_TYPE_CANONICAL[component_type.lower()]
-        if original_type != component_type:
-            print(f"[BUILD] Normalized component type: '{original_type}' → '{component_type}'")
-    elif component_type and component_type not in COMPONENT_TYPE_CANONICAL.values():
-        print(f"[BUILD] Unknown component type: '{component_type}' (will use fallback)")
+# Indented encoder for fallback previews; reused so the encoder is built once
+PREVIEW_JSON_ENCODER = json.JSONEncoder(indent=2)
 
-    try:
-        # Map component types to generator functions
-        if component_type == "TLDR":
-            content = props.get("content", "Summary of the document")
-            if len(content) > 300:
-                content = content[:297] + "..."
-            return generate_tldr(content=content, max_length=props.get("max_length", 200))
-
-        elif component_type == "KeyTakeaways":
-            items = props.get("items", ["Key takeaway 1", "Key takeaway 2"])
-            if not items:
-                items = ["Key takeaway 1", "Key takeaway 2"]
-            return generate_key_takeaways(items=items[:5])
-
-        elif component_type == "StatCard":
-            # Map LLM props to generator signature: title, value, unit, change, change_type, highlight
-            change_val = props.get("trendValue", props.get("change_value", props.get("change")))
-            # Parse change value, handling string formats
-            change_float = None
-            if change_val is not None:
-                try:
-                    change_str = str(change_val).replace(",", "").replace("%", "").replace("+", "")
-                    change_float = float(change_str) if change_str else None
-                except (ValueError, TypeError):
-                    change_float = None
-
-            # Map trend to change_type (positive/negative/neutral)
-            trend = props.get("trend", "neutral")
-            change_type_map = {"up": "positive", "down": "negative", "positive": "positive", "negative": "negative"}
-            change_type = change_type_map.get(trend, "neutral")
-
-            return generate_stat_card(
-                title=props.get("label", props.get("title", "Metric")),
-                value=str(props.get("value", "N/A")),
-                unit=props.get("unit"),
-                change=change_float,
-                change_type=change_type,
-                highlight=props.get("highlight", False)
-            )
 
-        elif component_type == "CodeBlock":
-            code = props.get("code", "// Code example")
-            if not code or not code.strip():
-                return None
-            return generate_code_block(
-                code=code,
-                language=props.get("language", "text")
-            )
+def _json_preview(value, limit: int = 200) -> str:
+    """Return the first ``limit`` chars of json.dumps(value, indent=2), encoding no further."""
+    chunks = []
+    length = 0
+    for chunk in PREVIEW_JSON_ENCODER.iterencode(value):
+        chunks.append(chunk)
+        length += len(chunk)
+        if length >= limit:
+            break
+    return "".join(chunks)[:limit]
 
-        elif component_type == "StepCard":
-            return generate_step_card(
-                step_number=props.get("step_number", props.get("number", 1)),
-                title=props.get("title", "Step"),
-                description=props.get("description", "Step description")
-            )
 
-        elif component_type == "CalloutCard":
-            return generate_callout_card(
-                type=props.get("type", "info"),
-                title=props.get("title", "Note"),
-                content=props.get("content", "Important information")
-            )
+# Spec builders keyed by canonical PascalCase component type
+COMPONENT_BUILDERS: dict[str, Callable[[dict, dict], A2UIComponent | None]] = {}
 
-        elif component_type == "VideoCard":
-            video_url = props.get("video_url", props.get("url", ""))
-            if not video_url:
-                return None
-            return generate_video_card(
-                video_url=video_url,
-                title=props.get("title", "Video"),
-                description=props.get("description", "")
-            )
 
-        elif component_type == "RepoCard":
-            return generate_repo_card(
-                name=props.get("name", "Repository"),
-                owner=props.get("owner"),
-                repo_url=props.get("repo_url", props.get("url", "https://github.com"))
-            )
+def _register_builder(component_type: str):
+    """Register a function that builds a component of the given type from LLM props."""
+    def decorator(builder):
+        COMPONENT_BUILDERS[component_type] = builder
+        return builder
+    return decorator
 
-        elif component_type == "LinkCard":
-            url = props.get("url", "")
-            if not is_valid_external_url(url):
-                print(f"[SKIP] LinkCard with invalid URL: {url!r}")
-                return None
-            return generate_link_card(
-                url=url,
-                title=props.get("title", "Resource")
-            )
 
-        elif component_type == "DataTable":
-            headers = props.get("headers", ["Column 1", "Column 2"])
-            rows = props.get("rows", [["Data 1", "Data 2"]])
-            if not headers or not rows:
-                return None
-            return generate_data_table(headers=headers, rows=rows)
-
-        elif component_type == "HeadlineCard":
-            # Generator signature: title, summary, source, published_at, sentiment, image_url
-            return generate_headline_card(
-                title=props.get("headline", props.get("title", "Headline")),
-                summary=props.get("subheadline", props.get("subtitle", props.get("summary", ""))),
-                source=props.get("source", "Source"),
-                published_at=props.get("timestamp", props.get("published_at", props.get("publishedAt", ""))),
-                sentiment=props.get("sentiment", "neutral"),
-                image_url=props.get("image_url", props.get("imageUrl"))
-            )
+@_register_builder("TLDR")
+def _build_tldr(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    content = props.get("content", "Summary of the document")
+    if len(content) > 300:
+        content = content[:297] + "..."
+    return generate_tldr(content=content, max_length=props.get("max_length", 200))
 
-        elif component_type == "TableOfContents":
-            items = props.get("items", [])
-            if not items:
-                sections = content_analysis.get("sections", [])
-                items = [{"title": s, "anchor": f"#{s.lower().replace(' ', '-')}"} for s in sections[:8]]
-            if not items:
-                return None
-            return generate_table_of_contents(items=items)
-
-        elif component_type == "QuoteCard":
-            return generate_quote_card(
-                text=props.get("quote", props.get("text", "Quote text")),
-                author=props.get("author", "Unknown"),
-                source=props.get("source")
-            )
 
-        elif component_type == "ChecklistItem":
-            return generate_checklist_item(
-                text=props.get("text", "Checklist item"),
-                completed=props.get("completed", False)
-            )
+@_register_builder("KeyTakeaways")
+def _build_key_takeaways(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    items = props.get("items", ["Key takeaway 1", "Key takeaway 2"])
+    if not items:
+        items = ["Key takeaway 1", "Key takeaway 2"]
+    return generate_key_takeaways(items=items[:5])
 
-        elif component_type == "BulletPoint":
-            return generate_bullet_point(
-                text=props.get("text", "Bullet point")
-            )
 
-        elif component_type == "ExpertTip":
-            # Generator signature: title, content, expert_name, difficulty, category
-            tip_content = props.get("tip", props.get("content", "Expert tip"))
-            tip_title = props.get("title", "Expert Tip")
-            # If no explicit title but we have tip content, use a truncated version as title
-            if tip_title == "Expert Tip" and tip_content and len(tip_content) > 50:
-                tip_title = tip_content[:47] + "..."
-
-            return generate_expert_tip(
-                title=tip_title,
-                content=tip_content,
-                expert_name=props.get("expert", props.get("author", props.get("expert_name"))),
-                difficulty=props.get("difficulty"),
-                category=props.get("category")
-            )
+@_register_builder("StatCard")
+def _build_stat_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # Map LLM props to generator signature: title, value, unit, change, change_type, highlight
+    change_val = _first(props, "trendValue", "change_value", "change")
+    # Parse change value, handling string formats
+    change_float = _parse_numeric(change_val)
 
-        elif component_type == "Badge":
-            return generate_badge(
-                label=props.get("label", "Badge"),
-                count=props.get("count", 1)
-            )
+    # Map trend to change_type (positive/negative/neutral)
+    trend = props.get("trend", "neutral")
+    change_type_map = {"up": "positive", "down": "negative", "positive": "positive", "negative": "negative"}
+    change_type = change_type_map.get(trend, "neutral")
 
-        elif component_type == "Tag":
-            return generate_tag(
-                label=props.get("label", "Tag"),
-                type=props.get("type", "default")
-            )
+    return generate_stat_card(
+        title=_first(props, "label", "title", default="Metric"),
+        value=str(props.get("value", "N/A")),
+        unit=props.get("unit"),
+        change=change_float,
+        change_type=change_type,
+        highlight=props.get("highlight", False)
+    )
 
-        elif component_type == "Section":
-            # Sections need special handling for children
-            title = props.get("title", "Section")
-            children = props.get("children", [])
-            if not children:
-                children = ["placeholder"]
-            return generate_section(title=title, content=children)
 
-        elif component_type == "ComparisonTable":
-            items = props.get("items", [])
-            features = props.get("features", [])
-            if not items or not features:
-                return None
-            return generate_comparison_table(items=items, features=features)
-
-        elif component_type == "TrendIndicator":
-            # Parse value - handle commas, percentages, and plus signs
-            def parse_numeric(val, default=0):
-                if val is None:
-                    return default
-                try:
-                    val_str = str(val).replace(",", "").replace("%", "").replace("+", "").strip()
-                    return float(val_str) if val_str else default
-                except (ValueError, TypeError):
-                    return default
-
-            return generate_trend_indicator(
-                label=props.get("label", props.get("metric", "Metric")),
-                value=parse_numeric(props.get("value"), 0),
-                trend=props.get("direction", props.get("trend", "stable")),
-                change=parse_numeric(props.get("change", props.get("trendValue")), 0),
-                unit=props.get("unit", "")
-            )
+@_register_builder("CodeBlock")
+def _build_code_block(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    code = props.get("code", "// Code example")
+    if not code or not code.strip():
+        return None
+    return generate_code_block(
+        code=code,
+        language=props.get("language", "text")
+    )
 
-        elif component_type == "MetricRow":
-            # Handle both single metric and multiple metrics format
-            metrics_data = props.get("metrics", [])
-            if metrics_data and isinstance(metrics_data, list):
-                # Convert to expected format
-                metrics = []
-                for m in metrics_data:
-                    if isinstance(m, dict):
-                        metrics.append({
-                            "label": m.get("label", "Metric"),
-                            "value": m.get("value", "N/A"),
-                            "unit": m.get("unit", "")
-                        })
-                return generate_metric_row(
-                    label=props.get("title", props.get("label", "")),
-                    metrics=metrics
-                )
-            else:
-                return generate_metric_row(
-                    label=props.get("label", props.get("title", "Metric")),
-                    value=props.get("value", "N/A"),
-                    unit=props.get("unit", "")
-                )
-
-        elif component_type == "ComparisonBar":
-            # Generator signature: label, items, max_value
-            items = props.get("items", [])
-            if not items:
-                return None
-            return generate_comparison_bar(
-                label=props.get("title", props.get("label", "Comparison")),
-                items=items,
-                max_value=props.get("max_value", props.get("maxValue"))
-            )
 
-        elif component_type == "RankedItem":
-            # Map LLM props (title, description) to frontend props (label, value)
-            return generate_component("a2ui.RankedItem", {
-                "rank": props.get("rank", 1),
-                "label": props.get("title", props.get("label", "Item")),
-                "value": props.get("description", props.get("value", "")),
-                "badge": props.get("badge"),
-                "score": props.get("score")
-            })
+@_register_builder("StepCard")
+def _build_step_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_step_card(
+        step_number=_first(props, "step_number", "number", default=1),
+        title=props.get("title", "Step"),
+        description=props.get("description", "Step description")
+    )
 
-        elif component_type == "ProConItem":
-            # LLM can output two formats:
-            # 1. Individual item: {type: 'pro'|'con', label: '...', description: '...'}
-            # 2. Batch format: {type: 'pros'|'cons', items: ['item1', 'item2'], title: '...'}
-            item_type = props.get("type", "info").lower()
-            items = props.get("items", [])
 
-            # Handle batch format - return FIRST item as proper ProConItem
-            # The orchestrator loop will handle expansion for multiple items
-            if items and isinstance(items, list):
-                is_pro = item_type in ("pro", "pros")
-                is_con = item_type in ("con", "cons")
+@_register_builder("CalloutCard")
+def _build_callout_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_callout_card(
+        type=props.get("type", "info"),
+        title=props.get("title", "Note"),
+        content=props.get("content", "Important information")
+    )
 
-                if is_pro or is_con:
-                    # Return the first item as a properly formatted ProConItem
-                    first_item = items[0] if items else "Item"
-                    return generate_component("a2ui.ProConItem", {
-                        "type": "pro" if is_pro else "con",
-                        "label": first_item,
-                        "description": props.get("title") if len(items) == 1 else None
-                    })
-
-            # Handle individual item format directly
-            if item_type in ("pro", "con"):
-                return generate_component("a2ui.ProConItem", {
-                    "type": item_type,
-                    "label": props.get("label", props.get("text", "Item")),
-                    "description": props.get("description"),
-                    "weight": props.get("weight")
-                })
 
-            # Legacy format with separate pros and cons arrays
-            pros = props.get("pros", [])
-            cons = props.get("cons", [])
-            if pros:
-                return generate_component("a2ui.ProConItem", {
-                    "type": "pro",
-                    "label": pros[0] if pros else "Advantage"
-                })
-            if cons:
-                return generate_component("a2ui.ProConItem", {
-                    "type": "con",
-                    "label": cons[0] if cons else "Disadvantage"
-                })
+@_register_builder("VideoCard")
+def _build_video_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    video_url = _first(props, "video_url", "url", default="")
+    if not video_url:
+        return None
+    return generate_video_card(
+        video_url=video_url,
+        title=props.get("title", "Video"),
+        description=props.get("description", "")
+    )
 
-            return None
-
-        elif component_type == "Accordion":
-            # LLM outputs sections with text content, but generate_accordion expects
-            # component IDs. Convert to a CalloutCard with formatted section list instead.
-            title = props.get("title", "Details")
-            sections = props.get("sections", props.get("items", []))
-
-            if sections:
-                # Format sections as collapsible-style text
-                formatted_sections = []
-                for section in sections[:10]:
-                    if isinstance(section, dict):
-                        sec_title = section.get("title", "Section")
-                        sec_content = section.get("content", "")
-                        formatted_sections.append(f"**{sec_title}**: {sec_content}")
-                    else:
-                        formatted_sections.append(str(section))
-
-                return generate_callout_card(
-                    type="info",
-                    title=title,
-                    content="\n\n".join(formatted_sections)
-                )
-            return None
-
-        elif component_type == "ExecutiveSummary":
-            # Extract key_metrics (dict) and recommendations (list) from LLM props
-            # The LLM may use various prop names, so we handle multiple formats
-            key_metrics = props.get("key_metrics", props.get("metrics", props.get("keyMetrics")))
-
-            # Recommendations can come from highlights, key_points, or recommendations
-            recommendations = props.get("recommendations", props.get("highlights", props.get("key_points")))
-            # Ensure recommendations is a list (may be None)
-            if recommendations and not isinstance(recommendations, list):
-                recommendations = [recommendations] if isinstance(recommendations, str) else None
-
-            return generate_executive_summary(
-                title=props.get("title", "Executive Summary"),
-                summary=props.get("summary", props.get("content", "Summary content")),
-                key_metrics=key_metrics,
-                recommendations=recommendations
-            )
 
-        elif component_type == "Grid":
-            # Grid component expects child component IDs, not text
-            # For now, convert to a simple Section with title
-            title = props.get("title", "Grid Content")
-            columns = props.get("columns", 2)
-            children = props.get("children", [])
-
-            # If children are actual text descriptions, render as info
-            if children and isinstance(children[0], str):
-                return generate_callout_card(
-                    type="info",
-                    title=title,
-                    content=f"Layout: {columns} columns with {len(children)} items"
-                )
-            return None
-
-        elif component_type == "ToolCard":
-            name = props.get("name", props.get("title", "Tool"))
-            description = props.get("description", "")
-            url = props.get("url", "")
-
-            # ToolCard requires a valid external URL
-            if not is_valid_external_url(url):
-                print(f"[SKIP] ToolCard '{name}' with invalid URL: {url!r}")
-                return None
-
-            if url and url.startswith(("http://", "https://")):
-                return generate_tool_card(
-                    name=name,
-                    description=description,
-                    url=url,
-                    category=props.get("category"),
-                    pricing=props.get("pricing"),
-                    features=props.get("features", [])[:5] if props.get("features") else None
-                )
-            else:
-                # Fallback to LinkCard-style display without URL
-                return generate_component("a2ui.ToolCard", {
-                    "name": name,
-                    "description": description,
-                    "url": url or "https://example.com",
-                    "category": props.get("category", "tool")
+@_register_builder("RepoCard")
+def _build_repo_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_repo_card(
+        name=props.get("name", "Repository"),
+        owner=props.get("owner"),
+        repo_url=_first(props, "repo_url", "url", default="https://github.com")
+    )
+
+
+@_register_builder("LinkCard")
+def _build_link_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    url = props.get("url", "")
+    if not is_valid_external_url(url):
+        print(f"[SKIP] LinkCard with invalid URL: {url!r}")
+        return None
+    return generate_link_card(
+        url=url,
+        title=props.get("title", "Resource")
+    )
+
+
+@_register_builder("DataTable")
+def _build_data_table(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    headers = props.get("headers", ["Column 1", "Column 2"])
+    rows = props.get("rows", [["Data 1", "Data 2"]])
+    if not headers or not rows:
+        return None
+    return generate_data_table(headers=headers, rows=rows)
+
+
+@_register_builder("HeadlineCard")
+def _build_headline_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # Generator signature: title, summary, source, published_at, sentiment, image_url
+    return generate_headline_card(
+        title=_first(props, "headline", "title", default="Headline"),
+        summary=_first(props, "subheadline", "subtitle", "summary", default=""),
+        source=props.get("source", "Source"),
+        published_at=_first(props, "timestamp", "published_at", "publishedAt", default=""),
+        sentiment=props.get("sentiment", "neutral"),
+        image_url=_first(props, "image_url", "imageUrl")
+    )
+
+
+@_register_builder("TableOfContents")
+def _build_table_of_contents(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    items = props.get("items", ())
+    if not items:
+        sections = content_analysis.get("sections", [])
+        items = [{"title": s, "anchor": f"#{s.lower().replace(' ', '-')}"} for s in sections[:8]]
+    if not items:
+        return None
+    return generate_table_of_contents(items=items)
+
+
+@_register_builder("QuoteCard")
+def _build_quote_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_quote_card(
+        text=_first(props, "quote", "text", default="Quote text"),
+        author=props.get("author", "Unknown"),
+        source=props.get("source")
+    )
+
+
+@_register_builder("ChecklistItem")
+def _build_checklist_item(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_checklist_item(
+        text=props.get("text", "Checklist item"),
+        completed=props.get("completed", False)
+    )
+
+
+@_register_builder("BulletPoint")
+def _build_bullet_point(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_bullet_point(
+        text=props.get("text", "Bullet point")
+    )
+
+
+@_register_builder("ExpertTip")
+def _build_expert_tip(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # Generator signature: title, content, expert_name, difficulty, category
+    tip_content = _first(props, "tip", "content", default="Expert tip")
+    tip_title = props.get("title", "Expert Tip")
+    # If no explicit title but we have tip content, use a truncated version as title
+    if tip_title == "Expert Tip" and tip_content and len(tip_content) > 50:
+        tip_title = tip_content[:47] + "..."
+
+    return generate_expert_tip(
+        title=tip_title,
+        content=tip_content,
+        expert_name=_first(props, "expert", "author", "expert_name"),
+        difficulty=props.get("difficulty"),
+        category=props.get("category")
+    )
+
+
+@_register_builder("Badge")
+def _build_badge(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_badge(
+        label=props.get("label", "Badge"),
+        count=props.get("count", 1)
+    )
+
+
+@_register_builder("Tag")
+def _build_tag(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_tag(
+        label=props.get("label", "Tag"),
+        type=props.get("type", "default")
+    )
+
+
+@_register_builder("Section")
+def _build_section(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # Sections need special handling for children
+    title = props.get("title", "Section")
+    children = props.get("children", ())
+    if not children:
+        children = ["placeholder"]
+    return generate_section(title=title, content=children)
+
+
+@_register_builder("ComparisonTable")
+def _build_comparison_table(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    items = props.get("items", ())
+    features = props.get("features", ())
+    if not items or not features:
+        return None
+    return generate_comparison_table(items=items, features=features)
+
+
+@_register_builder("TrendIndicator")
+def _build_trend_indicator(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_trend_indicator(
+        label=_first(props, "label", "metric", default="Metric"),
+        value=_parse_numeric(props.get("value"), 0),
+        trend=_first(props, "direction", "trend", default="stable"),
+        change=_parse_numeric(_first(props, "change", "trendValue"), 0),
+        unit=props.get("unit", "")
+    )
+
+
+@_register_builder("MetricRow")
+def _build_metric_row(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # Handle both single metric and multiple metrics format
+    metrics_data = props.get("metrics", ())
+    if metrics_data and isinstance(metrics_data, list):
+        # Convert to expected format
+        metrics = []
+        for m in metrics_data:
+            if isinstance(m, dict):
+                metrics.append({
+                    "label": m.get("label", "Metric"),
+                    "value": m.get("value", "N/A"),
+                    "unit": m.get("unit", "")
                 })
+        return generate_metric_row(
+            label=_first(props, "title", "label", default=""),
+            metrics=metrics
+        )
+    else:
+        return generate_metric_row(
+            label=_first(props, "label", "title", default="Metric"),
+            value=props.get("value", "N/A"),
+            unit=props.get("unit", "")
+        )
 
-        elif component_type == "BookCard":
-            return generate_book_card(
-                title=props.get("title", "Book"),
-                author=props.get("author", "Unknown Author"),
-                year=props.get("year"),
-                isbn=props.get("isbn"),
-                url=props.get("url"),
-                rating=props.get("rating"),
-                description=props.get("description")
-            )
 
-        elif component_type == "TagGroup":
-            # TagGroup is deprecated - convert to TagCloud
-            tags = props.get("tags", props.get("items", []))
-            if tags:
-                # Convert to TagCloud format
-                tag_items = []
-                for t in tags[:20]:
-                    if isinstance(t, str):
-                        tag_items.append({"name": t, "count": 1})
-                    elif isinstance(t, dict):
-                        tag_items.append({"name": t.get("label", t.get("name", str(t))), "count": t.get("count", 1)})
-                return generate_component("a2ui.TagCloud", {"tags": tag_items})
-            return None
-
-        elif component_type == "TagCloud":
-            tags = props.get("tags", props.get("items", []))
-            if tags:
-                # Normalize tag format
-                tag_items = []
-                for t in tags[:20]:
-                    if isinstance(t, str):
-                        tag_items.append({"name": t, "count": 1})
-                    elif isinstance(t, dict):
-                        tag_items.append({"name": t.get("label", t.get("name", str(t))), "count": t.get("count", 1)})
-                return generate_component("a2ui.TagCloud", {"tags": tag_items})
-            return None
-
-        elif component_type == "CategoryBadge":
-            return generate_component("a2ui.CategoryBadge", {
-                "category": props.get("category", props.get("label", "Category")),
-                "color": props.get("color"),
-                "icon": props.get("icon"),
-                "size": props.get("size", "md"),
-            })
+@_register_builder("ComparisonBar")
+def _build_comparison_bar(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # Generator signature: label, items, max_value
+    items = props.get("items", ())
+    if not items:
+        return None
+    return generate_comparison_bar(
+        label=_first(props, "title", "label", default="Comparison"),
+        items=items,
+        max_value=_first(props, "max_value", "maxValue")
+    )
 
-        elif component_type == "StatusIndicator":
-            return generate_component("a2ui.StatusIndicator", {
-                "status": props.get("status", "pending"),
-                "label": props.get("label"),
-                "pulse": props.get("pulse", False),
-            })
 
-        elif component_type == "PriorityBadge":
-            return generate_component("a2ui.PriorityBadge", {
-                "priority": props.get("priority", props.get("level", "medium")),
+@_register_builder("RankedItem")
+def _build_ranked_item(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # Map LLM props (title, description) to frontend props (label, value)
+    return generate_component("a2ui.RankedItem", {
+        "rank": props.get("rank", 1),
+        "label": _first(props, "title", "label", default="Item"),
+        "value": _first(props, "description", "value", default=""),
+        "badge": props.get("badge"),
+        "score": props.get("score")
+    })
+
+
+@_register_builder("ProConItem")
+def _build_pro_con_item(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # LLM can output two formats:
+    # 1. Individual item: {type: 'pro'|'con', label: '...', description: '...'}
+    # 2. Batch format: {type: 'pros'|'cons', items: ['item1', 'item2'], title: '...'}
+    item_type = props.get("type", "info").lower()
+    items = props.get("items", ())
+
+    # Handle batch format - return FIRST item as proper ProConItem
+    # The orchestrator loop will handle expansion for multiple items
+    if items and isinstance(items, list):
+        is_pro = item_type in ("pro", "pros")
+        is_con = item_type in ("con", "cons")
+
+        if is_pro or is_con:
+            # Return the first item as a properly formatted ProConItem
+            first_item = items[0] if items else "Item"
+            return generate_component("a2ui.ProConItem", {
+                "type": "pro" if is_pro else "con",
+                "label": first_item,
+                "description": props.get("title") if len(items) == 1 else None
             })
 
-        elif component_type == "DifficultyBadge":
-            return generate_component("a2ui.DifficultyBadge", {
-                "level": props.get("level", props.get("difficulty", "intermediate")),
-            })
+    # Handle individual item format directly
+    if item_type in ("pro", "con"):
+        return generate_component("a2ui.ProConItem", {
+            "type": item_type,
+            "label": _first(props, "label", "text", default="Item"),
+            "description": props.get("description"),
+            "weight": props.get("weight")
+        })
+
+    # Legacy format with separate pros and cons arrays
+    pros = props.get("pros", ())
+    cons = props.get("cons", ())
+    if pros:
+        return generate_component("a2ui.ProConItem", {
+            "type": "pro",
+            "label": pros[0] if pros else "Advantage"
+        })
+    if cons:
+        return generate_component("a2ui.ProConItem", {
+            "type": "con",
+            "label": cons[0] if cons else "Disadvantage"
+        })
+
+    return None
+
+
+@_register_builder("Accordion")
+def _build_accordion(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # LLM outputs sections with text content, but generate_accordion expects
+    # component IDs. Convert to a CalloutCard with formatted section list instead.
+    title = props.get("title", "Details")
+    sections = _first(props, "sections", "items", default=())
+
+    if sections:
+        # Format sections as collapsible-style text
+        formatted_sections = []
+        for section in sections[:10]:
+            if isinstance(section, dict):
+                sec_title = section.get("title", "Section")
+                sec_content = section.get("content", "")
+                formatted_sections.append(f"**{sec_title}**: {sec_content}")
+            else:
+                formatted_sections.append(str(section))
 
-        elif component_type == "ProfileCard":
-            return generate_component("a2ui.ProfileCard", {
-                "name": props.get("name", "Person"),
-                "title": props.get("title", props.get("role", "")),
-                "bio": props.get("bio", props.get("description", "")),
-                "imageUrl": props.get("imageUrl", props.get("avatar")),
-                "links": props.get("links", [])
-            })
+        return generate_callout_card(
+            type="info",
+            title=title,
+            content="\n\n".join(formatted_sections)
+        )
+    return None
+
+
+@_register_builder("ExecutiveSummary")
+def _build_executive_summary(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # Extract key_metrics (dict) and recommendations (list) from LLM props
+    # The LLM may use various prop names, so we handle multiple formats
+    key_metrics = _first(props, "key_metrics", "metrics", "keyMetrics")
+
+    # Recommendations can come from highlights, key_points, or recommendations
+    recommendations = _first(props, "recommendations", "highlights", "key_points")
+    # Ensure recommendations is a list (may be None)
+    if recommendations and not isinstance(recommendations, list):
+        recommendations = [recommendations] if isinstance(recommendations, str) else None
+
+    return generate_executive_summary(
+        title=props.get("title", "Executive Summary"),
+        summary=_first(props, "summary", "content", default="Summary content"),
+        key_metrics=key_metrics,
+        recommendations=recommendations
+    )
 
-        elif component_type == "CompanyCard":
-            return generate_component("a2ui.CompanyCard", {
-                "name": props.get("name", "Company"),
-                "description": props.get("description", ""),
-                "industry": props.get("industry"),
-                "logoUrl": props.get("logoUrl", props.get("logo")),
-                "website": props.get("website", props.get("url"))
-            })
 
-        elif component_type == "TimelineEvent":
-            event_type = props.get("event_type", props.get("eventType", "announcement"))
-            if event_type not in {"article", "announcement", "milestone", "update"}:
-                event_type = "announcement"
-            return generate_timeline_event(
-                title=props.get("title", "Event"),
-                timestamp=props.get("timestamp", props.get("date", "")),
-                content=props.get("content", props.get("description", "")),
-                event_type=event_type,
-            )
+@_register_builder("Grid")
+def _build_grid(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    # Grid component expects child component IDs, not text
+    # For now, convert to a simple Section with title
+    title = props.get("title", "Grid Content")
+    columns = props.get("columns", 2)
+    children = props.get("children", ())
+
+    # If children are actual text descriptions, render as info
+    if children and isinstance(children[0], str):
+        return generate_callout_card(
+            type="info",
+            title=title,
+            content=f"Layout: {columns} columns with {len(children)} items"
+        )
+    return None
 
-        else:
-            # Generic fallback - create a callout with the data
-            print(f"[COMPONENT] Unknown type '{component_type}', using CalloutCard fallback")
-            return generate_callout_card(
-                type="info",
-                title=component_type,
-                content=json.dumps(props, indent=2)[:200] if props else "Component data"
-            )
+
+@_register_builder("ToolCard")
+def _build_tool_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    name = _first(props, "name", "title", default="Tool")
+    description = props.get("description", "")
+    url = props.get("url", "")
+
+    # ToolCard requires a valid external URL
+    if not is_valid_external_url(url):
+        print(f"[SKIP] ToolCard '{name}' with invalid URL: {url!r}")
+        return None
+
+    if url and url.startswith(URL_SCHEMES):
+        features = props.get("features")
+        return generate_tool_card(
+            name=name,
+            description=description,
+            url=url,
+            category=props.get("category"),
+            pricing=props.get("pricing"),
+            features=features[:5] if features else None
+        )
+    else:
+        # Fallback to LinkCard-style display without URL
+        return generate_component("a2ui.ToolCard", {
+            "name": name,
+            "description": description,
+            "url": url or "https://example.com",
+            "category": props.get("category", "tool")
+        })
+
+
+@_register_builder("BookCard")
+def _build_book_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_book_card(
+        title=props.get("title", "Book"),
+        author=props.get("author", "Unknown Author"),
+        year=props.get("year"),
+        isbn=props.get("isbn"),
+        url=props.get("url"),
+        rating=props.get("rating"),
+        description=props.get("description")
+    )
+
+
+def _tag_cloud_items(tags: list) -> list[dict]:
+    """Normalize up to 20 LLM tags (strings or dicts) into TagCloud items."""
+    return [
+        {"name": t, "count": 1} if isinstance(t, str)
+        else {"name": _first(t, "label", "name", default=str(t)), "count": t.get("count", 1)}
+        for t in tags[:20]
+        if isinstance(t, (str, dict))
+    ]
+
+
+# TagGroup is deprecated - it is built as a TagCloud
+@_register_builder("TagGroup")
+@_register_builder("TagCloud")
+def _build_tag_cloud(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    tags = _first(props, "tags", "items", default=())
+    if tags:
+        return generate_component("a2ui.TagCloud", {"tags": _tag_cloud_items(tags)})
+    return None
+
+
+@_register_builder("CategoryBadge")
+def _build_category_badge(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_component("a2ui.CategoryBadge", {
+        "category": _first(props, "category", "label", default="Category"),
+        "color": props.get("color"),
+        "icon": props.get("icon"),
+        "size": props.get("size", "md"),
+    })
+
+
+@_register_builder("StatusIndicator")
+def _build_status_indicator(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_component("a2ui.StatusIndicator", {
+        "status": props.get("status", "pending"),
+        "label": props.get("label"),
+        "pulse": props.get("pulse", False),
+    })
+
+
+@_register_builder("PriorityBadge")
+def _build_priority_badge(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_component("a2ui.PriorityBadge", {
+        "priority": _first(props, "priority", "level", default="medium"),
+    })
+
+
+@_register_builder("DifficultyBadge")
+def _build_difficulty_badge(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_component("a2ui.DifficultyBadge", {
+        "level": _first(props, "level", "difficulty", default="intermediate"),
+    })
+
+
+@_register_builder("ProfileCard")
+def _build_profile_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_component("a2ui.ProfileCard", {
+        "name": props.get("name", "Person"),
+        "title": _first(props, "title", "role", default=""),
+        "bio": _first(props, "bio", "description", default=""),
+        "imageUrl": _first(props, "imageUrl", "avatar"),
+        "links": props.get("links", [])
+    })
+
+
+@_register_builder("CompanyCard")
+def _build_company_card(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    return generate_component("a2ui.CompanyCard", {
+        "name": props.get("name", "Company"),
+        "description": props.get("description", ""),
+        "industry": props.get("industry"),
+        "logoUrl": _first(props, "logoUrl", "logo"),
+        "website": _first(props, "website", "url")
+    })
+
+
+@_register_builder("TimelineEvent")
+def _build_timeline_event(props: dict, content_analysis: dict) -> A2UIComponent | None:
+    event_type = _first(props, "event_type", "eventType", default="announcement")
+    if event_type not in TIMELINE_EVENT_TYPES:
+        event_type = "announcement"
+    return generate_timeline_event(
+        title=props.get("title", "Event"),
+        timestamp=_first(props, "timestamp", "date", default=""),
+        content=_first(props, "content", "description", default=""),
+        event_type=event_type,
+    )
+
+
+# Maps lowercase versions of component types to canonical PascalCase names
+COMPONENT_TYPE_CANONICAL = {name.lower(): name for name in COMPONENT_BUILDERS}
+
+
+def build_a2ui_component(spec: dict, content_analysis: dict) -> A2UIComponent | None:
+    """
+    Build an A2UIComponent from a specification dictionary.
+
+    Args:
+        spec: Component specification from LLM
+        content_analysis: Content analysis for fallback data
+
+    Returns:
+        A2UIComponent instance or None if invalid
+    """
+    component_type = spec.get("component_type", "")
+    props = spec.get("props", {})
+
+    # Normalize component type - strip whitespace
+    component_type = component_type.strip()
+
+    # Try to normalize type (handle various casing from LLM)
+    original_type = component_type
+    if component_type.lower() in COMPONENT_TYPE_CANONICAL:
+        component_type = COMPONENT_TYPE_CANONICAL[component_type.lower()]
+        if original_type != component_type:
+            logger.debug("[BUILD] Normalized component type: %r → %r", original_type, component_type)
+    elif component_type:
+        print(f"[BUILD] Unknown component type: '{component_type}' (will use fallback)")
+
+    builder = COMPONENT_BUILDERS.get(component_type)
+
+    try:
+        if builder is not None:
+            return builder(props, content_analysis)
+
+        # Generic fallback - create a callout with the data
+        print(f"[COMPONENT] Unknown type '{component_type}', using CalloutCard fallback")
+        return generate_callout_card(
+            type="info",
+            title=component_type,
+            content=_json_preview(props) if props else "Component data"
+        )
 
     except Exception as e:
         print(f"[COMPONENT ERROR] Failed to build {component_type}: {e}")
@@ -1153,18 +1445,13 @@ async def orchestrate_dashboard_with_llm(markdown_content: str) -> AsyncGenerato
     print("[ORCHESTRATOR] Starting LLM-powered dashboard generation")
     print("="*60)
 
-    # Step 1: Parse markdown structure (fast, no LLM)
-    parsed = parse_markdown(markdown_content)
+    # Step 1: Parse markdown structure (local CPU, cached per document)
+    parsed = parse_markdown_cached(markdown_content)
     print(f"[PARSE] Title: {parsed.get('title', 'Untitled')}")
     print(f"[PARSE] Sections: {len(parsed.get('sections', []))}")
     print(f"[PARSE] Code blocks: {len(parsed.get('code_blocks', []))}")
 
-    # Step 2: Analyze content with LLM
-    content_analysis = await analyze_content_with_llm(markdown_content)
-
-    # Merge parsed data with LLM analysis
-    full_analysis = {
-        **content_analysis,
+    structure = {
         "sections": parsed.get("sections", []),
         "code_blocks": parsed.get("code_blocks", []),
         "tables": parsed.get("tables", []),
@@ -1173,7 +1460,18 @@ async def orchestrate_dashboard_with_llm(markdown_content: str) -> AsyncGenerato
         "github_links": parsed.get("github_links", []),
     }
 
-    # Step 3: Select layout with LLM
+    # Step 2: Analyze content with LLM (local heuristics for short documents)
+    content_analysis = await analyze_content_with_llm(markdown_content)
+
+    # Merge parsed data with LLM analysis
+    full_analysis = {
+        **content_analysis,
+        **structure,
+    }
+
+    # Step 3: Select layout with LLM. It waits for the analysis because the
+    # LLM's document type is the main signal in the layout prompt, and long
+    # documents are exactly where it disagrees with the heuristic.
     layout_decision = await select_layout_with_llm(full_analysis)
 
     # Step 4: Select components with LLM
@@ -1183,16 +1481,14 @@ async def orchestrate_dashboard_with_llm(markdown_content: str) -> AsyncGenerato
         markdown_content
     )
 
-    # Step 5: Expand batched specs (e.g., ProConItem with multiple items)
-    expanded_specs = expand_component_specs(component_specs)
-
-    # Step 6: Build and yield A2UI components
-    print(f"\n[BUILD] Building {len(expanded_specs)} components (expanded from {len(component_specs)} specs)...")
+    # Steps 5-6: Expand batched specs (e.g., ProConItem with multiple items),
+    # then build and yield A2UI components
+    print(f"\n[BUILD] Building components from {len(component_specs)} specs...")
 
     components_built = 0
     component_types_used = set()
 
-    for spec in expanded_specs:
+    for spec in expand_component_specs(component_specs):
         component = build_a2ui_component(spec, full_analysis)
         if component:
             # Apply layout width hints and semantic zone
@@ -1200,7 +1496,11 @@ async def orchestrate_dashboard_with_llm(markdown_content: str) -> AsyncGenerato
 
             components_built += 1
             component_types_used.add(component.type)
-            print(f"[YIELD] Component {components_built}: {component.type} (id={component.id}, width={component.layout.get('width', 'full')}, zone={component.zone})")
+            logger.debug(
+                "[YIELD] Component %d: %s (id=%s, width=%s, zone=%s)",
+                components_built, component.type, component.id,
+                component.layout.get('width', 'full'), component.zone,
+            )
             yield component
 
     print(f"\n[COMPLETE] Generated {components_built} components with {len(component_types_used)} unique types")
@@ -8,6 +8,7 @@ for bidirectional state synchronization and streaming agent responses.
 import os
 import re
 import json
+import traceback
 from dotenv import load_dotenv
 
 # Load environment variables first
@@ -19,6 +20,7 @@ from starlette.applications import Starlette
 from starlette.requests import Request
 
 from agent import agent, DashboardState
+from llm_orchestrator import close_http_client
 from pydantic_ai.ag_ui import StateDeps
 
 # Configuration
@@ -56,8 +58,19 @@ EVENT_TYPE_MAP = {
 }
 
 
+# Serialized AG-UI events lead with their type field
+EVENT_TYPE_PREFIX = '{"type":"'
+
+
 def transform_event_type(event_data: str) -> str:
     """Transform event type in SSE data from PascalCase to SCREAMING_SNAKE_CASE."""
+    # Fast path: events already typed in SCREAMING_SNAKE_CASE pass through without
+    # a JSON round trip, which matters for large state snapshot and delta payloads
+    if event_data.startswith(EVENT_TYPE_PREFIX):
+        type_end = event_data.find('"', len(EVENT_TYPE_PREFIX))
+        if type_end != -1 and event_data[len(EVENT_TYPE_PREFIX):type_end].isupper():
+            return event_data
+
     try:
         data = json.loads(event_data)
         if "type" in data:
@@ -106,19 +119,18 @@ async def transform_sse_stream(original_response):
                 yield '\n'.join(transformed_lines)
             except Exception as chunk_error:
                 print(f"[SSE ERROR] Error processing chunk: {chunk_error}", flush=True)
-                import traceback
                 traceback.print_exc()
                 raise
     except Exception as stream_error:
         print(f"[SSE ERROR] Stream error: {stream_error}", flush=True)
-        import traceback
         traceback.print_exc()
         raise
 
 
 # Create the base AG-UI app using Pydantic AI's built-in integration
+# The empty initial state needs no validation, so construct it directly
 _base_ag_ui_app = agent.to_ag_ui(
-    deps=StateDeps(DashboardState()),
+    deps=StateDeps(DashboardState.model_construct()),
 )
 
 # Create our wrapper app
@@ -135,17 +147,13 @@ async def ag_ui_endpoint(request: Request):
         body = await request.body()
         print(f"[AG-UI] Received request: {len(body)} bytes", flush=True)
 
-        # Create a new request with the body for the base app
-        from starlette.requests import Request as StarletteRequest
-        from starlette.datastructures import Headers
-
         # We need to recreate the request because we consumed the body
         scope = dict(request.scope)
 
         async def receive():
             return {"type": "http.request", "body": body}
 
-        new_request = StarletteRequest(scope, receive)
+        new_request = Request(scope, receive)
 
         # Get the original response from the base AG-UI app
         # Find the POST route handler
@@ -167,7 +175,6 @@ async def ag_ui_endpoint(request: Request):
         return original_response
     except Exception as e:
         print(f"[AG-UI ERROR] {e}", flush=True)
-        import traceback
         traceback.print_exc()
         return JSONResponse({"error": str(e)}, status_code=500)
 
@@ -248,6 +255,12 @@ async def startup():
         print("[+] OpenRouter API key configured")
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Shutdown event handler."""
+    await close_http_client()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=BACKEND_PORT, reload=True)
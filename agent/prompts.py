@@ -14,6 +14,9 @@ All prompts are designed to work with Pydantic AI's structured output capabiliti
 ensuring type-safe, validated responses.
 """
 
+import string
+from collections import Counter
+
 # ============================================================================
 # CONTENT ANALYSIS PROMPT
 # ============================================================================
@@ -22,10 +25,6 @@ CONTENT_ANALYSIS_PROMPT = """You are an expert content analyst specializing in M
 
 Your task is to analyze the provided Markdown document and extract structured information about its content, type, and key entities.
 
-## Document to Analyze
-
-{markdown_content}
-
 ## Analysis Requirements
 
 ### 1. Document Classification
@@ -101,6 +100,10 @@ Return a structured analysis with:
 4. **Focus on Relevance**: Only extract entities that are actually discussed, not just mentioned in passing
 5. **Provide Context**: Make your reasoning clear and specific to this document
 
+## Document to Analyze
+
+{markdown_content}
+
 Begin your analysis now."""
 
 
@@ -112,10 +115,6 @@ LAYOUT_SELECTION_PROMPT = """You are an expert UI/UX designer specializing in op
 
 Your task is to select the BEST layout type for displaying the analyzed content in a dynamic dashboard interface.
 
-## Content Analysis
-
-{content_analysis}
-
 ## Available Layout Types
 
 Choose ONE of the following layout types:
@@ -238,6 +237,10 @@ Return a structured layout selection with:
 4. **Provide Fallbacks**: Alternative layouts should be genuinely suitable backups
 5. **Prioritize Components**: List components that will make this layout most effective
 
+## Content Analysis
+
+{content_analysis}
+
 Begin your layout selection now."""
 
 
@@ -249,14 +252,6 @@ COMPONENT_SELECTION_PROMPT = """You are an expert A2UI component architect speci
 
 Your task is to select and configure the OPTIMAL set of A2UI components to represent the analyzed content in an engaging, scannable dashboard.
 
-## Content Analysis
-
-{content_analysis}
-
-## Selected Layout
-
-{layout_decision}
-
 ## Available A2UI Component Types
 
 ### News & Trends Components
@@ -563,6 +558,14 @@ Return a JSON array of component specifications:
 8. **Consolidate Lists**: Bullet points within a section go into ONE component (KeyTakeaways, CalloutCard) — not one RankedItem per bullet
 9. **Stay in Range**: 15-25 components for long documents. More is not better.
 
+## Content Analysis
+
+{content_analysis}
+
+## Selected Layout
+
+{layout_decision}
+
 Begin your component selection now."""
 
 
@@ -570,6 +573,23 @@ Begin your component selection now."""
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _static_prefix(template: str) -> str:
+    """Return the formatted text of a template up to its first placeholder."""
+    prefix = []
+    for literal_text, field_name, _, _ in string.Formatter().parse(template):
+        prefix.append(literal_text)
+        if field_name is not None:
+            break
+    return "".join(prefix)
+
+
+# Each template keeps its per-request input at the end, so every formatted
+# prompt starts with the same instructions. Sent as a cacheable prompt prefix.
+CONTENT_ANALYSIS_PREFIX = _static_prefix(CONTENT_ANALYSIS_PROMPT)
+LAYOUT_SELECTION_PREFIX = _static_prefix(LAYOUT_SELECTION_PROMPT)
+COMPONENT_SELECTION_PREFIX = _static_prefix(COMPONENT_SELECTION_PROMPT)
+
+
 def format_content_analysis_prompt(markdown_content: str) -> str:
     """
     Format the content analysis prompt with actual markdown content.
@@ -705,21 +725,24 @@ def validate_component_variety(components: list[dict]) -> dict:
             'violations': ['No components provided']
         }
 
-    # Count unique types
-    component_types = [c.get('component_type', '') for c in components]
-    unique_types = set(component_types)
-    unique_count = len(unique_types)
-
-    # Check consecutive same type
+    # Count types and track the longest same-type run in a single pass
+    type_counts = Counter()
     max_consecutive = 1
-    current_consecutive = 1
+    current_consecutive = 0
+    previous_type = None
 
-    for i in range(1, len(component_types)):
-        if component_types[i] == component_types[i-1]:
+    for component in components:
+        component_type = component.get('component_type', '')
+        type_counts[component_type] += 1
+        if component_type == previous_type:
             current_consecutive += 1
-            max_consecutive = max(max_consecutive, current_consecutive)
+            if current_consecutive > max_consecutive:
+                max_consecutive = current_consecutive
         else:
             current_consecutive = 1
+            previous_type = component_type
+
+    unique_count = len(type_counts)
 
     # Validation checks
     meets_min_types = unique_count >= 4
@@ -732,7 +755,7 @@ def validate_component_variety(components: list[dict]) -> dict:
         violations.append(f'Found {max_consecutive} consecutive same type, max allowed is 2')
 
     # Check for type dominance (no single type should be >40% of components)
-    type_distribution = {t: component_types.count(t) for t in unique_types}
+    type_distribution = dict(type_counts)
     meets_no_dominance = True
     if len(components) >= 5:
         for comp_type, count in type_distribution.items():
@@ -0,0 +1,80 @@
+"""
+Tests for LLM Orchestrator helpers.
+
+Covers the pure, network-free helpers in llm_orchestrator.py:
+- Section-aware document packing for the component selection prompt
+"""
+
+from pathlib import Path
+
+import pytest
+from llm_orchestrator import SECTION_TRUNCATED_MARKER, _pack_markdown_by_sections
+
+SAMPLE_DOCUMENTS_DIR = Path(__file__).resolve().parents[2] / "sample-documents"
+
+
+class TestPackMarkdownBySections:
+    """Test suite for _pack_markdown_by_sections."""
+
+    def test_short_document_is_unchanged(self):
+        """Test that a document within budget is returned as is."""
+        markdown = "# Title\n\nShort body.\n\n## Section\n\nMore text."
+        assert _pack_markdown_by_sections(markdown, 1000) == markdown
+
+    def test_keeps_every_section_header_within_budget(self):
+        """Test that long sections are shortened but every header survives."""
+        markdown = "".join(
+            f"## Section {i}\n" + "word " * (300 + i * 7) + "\n\n" for i in range(60)
+        )
+
+        packed = _pack_markdown_by_sections(markdown, 30000)
+
+        assert len(markdown) > 150000
+        assert len(packed) <= 30000
+        assert len(packed) > 27000  # Budget is used, not just respected
+        for i in range(60):
+            assert f"## Section {i}\n" in packed
+        assert SECTION_TRUNCATED_MARKER in packed
+
+    def test_many_short_sections_never_exceed_budget(self):
+        """Test that header and marker overhead can't push the output past max_chars."""
+        markdown = "".join(f"## S{i}\nshort body {i}\n\n" for i in range(3000))
+
+        packed = _pack_markdown_by_sections(markdown, 30000)
+
+        assert len(packed) <= 30000
+        assert packed == markdown[:30000]
+
+    def test_short_bodies_are_kept_whole(self):
+        """Test that bodies whose cut would save less than the marker are not cut."""
+        short_body = "brief note here\n\n"
+        markdown = "## Short\n" + short_body + "## Long\n" + "word " * 2000
+
+        packed = _pack_markdown_by_sections(markdown, 2000)
+
+        assert len(packed) <= 2000
+        assert packed.startswith("## Short\n" + short_body + "## Long\n")
+        assert packed.endswith(SECTION_TRUNCATED_MARKER)
+
+    def test_document_without_headers_is_truncated(self):
+        """Test that a document with no headers still fits the budget."""
+        markdown = "word " * 10000
+
+        packed = _pack_markdown_by_sections(markdown, 1000)
+
+        assert len(packed) <= 1000
+        assert packed.startswith("word word")
+
+    @pytest.mark.parametrize("filename", [
+        "ai-industry-statistics.md",
+        "top-10-coding-tools.md",
+        "agentic-workflows-tutorial.md",
+    ])
+    def test_retry_budget_shrinks_samples(self, filename):
+        """Test that the 15k retry budget actually bounds the bundled samples."""
+        markdown = (SAMPLE_DOCUMENTS_DIR / filename).read_text(encoding="utf-8")
+
+        packed = _pack_markdown_by_sections(markdown, 15000)
+
+        assert len(markdown) > 15000
+        assert 14000 < len(packed) <= 15000
@@ -10,12 +10,17 @@ Tests the orchestrate_dashboard function which wires together:
 - Component tree building
 """
 
+from pathlib import Path
+
 import pytest
 from a2ui_generator import (
     orchestrate_dashboard,
     A2UIComponent,
     reset_id_counter,
 )
+import content_analyzer
+
+SAMPLE_DOCUMENTS_DIR = Path(__file__).resolve().parents[2] / "sample-documents"
 
 
 class TestOrchestratorBasic:
@@ -73,6 +78,25 @@ class TestOrchestratorBasic:
         ids = [comp.id for comp in components]
         assert len(ids) == len(set(ids)), "All component IDs should be unique"
 
+    def test_orchestrate_dashboard_reuses_cached_parse(self, monkeypatch):
+        """Test that repeated orchestration of the same content reuses the cached parse."""
+        markdown = "# Cached Document\n\n## Section 1\n\nContent only parsed once."
+        calls = []
+        original_parse = content_analyzer.parse_markdown
+
+        def counting_parse(content):
+            calls.append(content)
+            return original_parse(content)
+
+        monkeypatch.setattr(content_analyzer, "parse_markdown", counting_parse)
+
+        first = orchestrate_dashboard(markdown)
+        reset_id_counter()
+        second = orchestrate_dashboard(markdown)
+
+        assert calls == [markdown]
+        assert [c.model_dump() for c in first] == [c.model_dump() for c in second]
+
 
 class TestOrchestratorVarietyEnforcement:
     """Test variety enforcement constraints."""
@@ -175,6 +199,19 @@ class TestOrchestratorContentTypes:
         """Reset ID counter before each test."""
         reset_id_counter()
 
+    @pytest.mark.parametrize("filename,expected_type", [
+        ("ai-industry-statistics.md", "research"),
+        ("claude-vs-gpt-comparison.md", "research"),
+        ("top-10-coding-tools.md", "tutorial"),
+    ])
+    def test_long_sample_classification(self, filename, expected_type):
+        """Test that keywords past the first few KB still drive classification."""
+        markdown = (SAMPLE_DOCUMENTS_DIR / filename).read_text(encoding="utf-8")
+        parsed = content_analyzer.parse_markdown(markdown)
+
+        assert len(markdown) > 16000
+        assert content_analyzer._classify_heuristic(markdown, parsed) == expected_type
+
     def test_tutorial_content_generates_code_blocks(self):
         """Test that tutorial content generates code blocks."""
         markdown = """
@@ -301,6 +338,16 @@ Also see: https://github.com/microsoft/vscode
         repo_cards = [c for c in components if c.type == "a2ui.RepoCard"]
         assert len(repo_cards) > 0
 
+    def test_github_link_query_string_not_in_repo_name(self):
+        """Test that query strings on GitHub URLs don't leak into the repo name."""
+        markdown = "# Repos\n\nSee https://github.com/facebook/react?tab=readme-ov-file for more.\n"
+
+        components = orchestrate_dashboard(markdown)
+
+        repo_card = next(c for c in components if c.type == "a2ui.RepoCard")
+        assert repo_card.props["name"] == "react"
+        assert repo_card.props["owner"] == "facebook"
+
 
 class TestOrchestratorComponentGeneration:
     """Test specific component generation scenarios."""
@@ -329,6 +376,18 @@ class TestOrchestratorComponentGeneration:
         tldr_components = [c for c in components if c.type == "a2ui.TLDR"]
         assert len(tldr_components) > 0
 
+    def test_tldr_uses_first_three_non_heading_lines(self):
+        """Test that TLDR summary is built from the first 3 non-heading lines."""
+        markdown = (
+            "# Article\n\n## Intro\n  First line.  \n\nSecond line.\n"
+            "## More\nThird line.\nFourth line.\n" + "Filler text. " * 50
+        )
+
+        components = orchestrate_dashboard(markdown)
+
+        tldr = next(c for c in components if c.type == "a2ui.TLDR")
+        assert tldr.props["content"] == "First line. Second line. Third line."
+
     def test_generates_table_of_contents_for_many_sections(self):
         """Test that many sections generate table of contents."""
         markdown = """
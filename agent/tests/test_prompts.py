@@ -14,6 +14,9 @@ from prompts import (
     CONTENT_ANALYSIS_PROMPT,
     LAYOUT_SELECTION_PROMPT,
     COMPONENT_SELECTION_PROMPT,
+    CONTENT_ANALYSIS_PREFIX,
+    LAYOUT_SELECTION_PREFIX,
+    COMPONENT_SELECTION_PREFIX,
     format_content_analysis_prompt,
     format_layout_selection_prompt,
     format_component_selection_prompt,
@@ -95,6 +98,20 @@ class TestPromptTemplates:
         assert "Example Bad Selection" in COMPONENT_SELECTION_PROMPT
         assert "AVOID" in COMPONENT_SELECTION_PROMPT
 
+    def test_formatted_prompts_share_static_prefix(self):
+        """Test that per-request input comes after each template's static instructions."""
+        analysis = {'document_type': 'tutorial', 'title': 'Prefix Test'}
+        layout = {'layout_type': 'instructional_layout'}
+
+        content_prompt = format_content_analysis_prompt("# Prefix Test")
+        layout_prompt = format_layout_selection_prompt(analysis)
+        component_prompt = format_component_selection_prompt(analysis, layout)
+
+        assert content_prompt.startswith(CONTENT_ANALYSIS_PREFIX)
+        assert layout_prompt.startswith(LAYOUT_SELECTION_PREFIX)
+        assert component_prompt.startswith(COMPONENT_SELECTION_PREFIX)
+        assert "Prefix Test" not in CONTENT_ANALYSIS_PREFIX + LAYOUT_SELECTION_PREFIX + COMPONENT_SELECTION_PREFIX
+
 
 class TestContentAnalysisPromptFormatting:
     """Test suite for content analysis prompt formatting."""